@@ -0,0 +1,188 @@
+"""Times the generosity analysis engine over a ladder of population sizes N and numbers of reputation values R.
+
+For each (N, R), in a process of its own, the state counts, wall time of each stage and the peak resident set size are
+recorded and written to a JSON file, so that runs can be compared over time. At small sizes the results are also checked
+against a reference built from the per-tuple functions (compute_transitions, tuple_utility) and the original O(N^2)
+fixation loop.
+
+Usage: `python benchmark.py --sizes 3x3,4x4,6x4 --output benchmark.json`
+"""
+
+import argparse
+import json
+import math
+import multiprocessing
+import platform
+import resource
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+import generosity
+
+#parameters of the figure in generosity.py
+E_A=0.025
+E_R=0.025
+G=0.01
+DONATE_UTIL=-0.1
+RECIEVE_UTIL=1.0
+BETA=10
+
+DEFAULT_SIZES="3x3,4x4,5x4,6x4,8x4,6x6"
+CHECK_MAX_STATES=2000 #largest chain checked against the reference implementation
+
+def peak_rss_mb():
+  """Peak resident set size of this process so far, in MB (ru_maxrss is in KB on Linux and bytes on macOS)"""
+  rss=resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+  return rss/2**20 if platform.system()=="Darwin" else rss/2**10
+
+def timed(f,*args,repeat=1):
+  """Returns (result,best wall time in seconds) of calling f(*args) repeat times, clearing the chain cache before each call"""
+  best=math.inf
+  for _ in range(repeat):
+    generosity.clear_chain_cache()
+    start=time.perf_counter()
+    result=f(*args)
+    best=min(best,time.perf_counter()-start)
+  return (result,best)
+
+def make_index(array_set):
+  """A simple caching function which allows one to map from ints to tuple pairs and back. returns d,r where d[i] takes an index and returns a tuple and r[a] takes a tuple and returns the index"""
+  i=0
+  d={}
+  r={}
+  for a in array_set:
+    d[i]=a
+    r[a]=i
+    i+=1
+  return (d,r)
+
+def reference_transition_matrix(num_s1,num_s2,s1,s2,e_a,e_r,g,r):
+  """Dense transition matrix built tuple by tuple with compute_transitions, in make_indices order"""
+  tuples=list(generosity.make_indices(r,num_s1,num_s2))
+  (index_to_tuple,tuple_to_index)=make_index(tuples)
+  tm=np.zeros([len(tuples),len(tuples)])
+  for t in tuples:
+    transition_probs=generosity.compute_transitions(t,s1,s2,e_a,e_r,g)
+    for p in transition_probs:
+      tm[tuple_to_index[t],tuple_to_index[p]]=transition_probs[p]
+  return tm
+
+def reference_compute_utility(num_s1,num_s2,s1,s2,e_a,e_r,g,r,donate_util,recieve_util):
+  """compute_utility using reference_transition_matrix, deeptime (if installed) and tuple_utility"""
+  tm=reference_transition_matrix(num_s1,num_s2,s1,s2,e_a,e_r,g,r)
+  method="deeptime" if generosity.MarkovStateModel is not None else "dense"
+  vec=generosity.stationary_distribution(tm,method)
+  util={s1:0,s2:0}
+  for (i,t) in enumerate(generosity.make_indices(r,num_s1,num_s2)):
+    u=generosity.tuple_utility(t,s1,s2,donate_util,recieve_util,e_a,e_r,g)
+    util[s1]+=u[s1]*vec[i]
+    util[s2]+=u[s2]*vec[i]
+  return util
+
+def reference_strat_transition_matrix(num_agents,e_a,e_r,g,r,donate_util,recieve_util,beta):
+  """The original strat_transition_matrix, recomputing every utility inside the na loop"""
+  fm=np.zeros([r+1,r+1])
+  for i in range(r+1):
+    for j in range(r+1):
+      sm=0
+      for na in range(1,num_agents):
+        tmp=1
+        for k in range(1,na+1):
+          u=reference_compute_utility(k,num_agents-k,i,j,e_a,e_r,g,r,donate_util,recieve_util)
+          tmp*=math.exp(-beta*(u[j]-u[i]))
+        sm+=tmp
+      fm[i,j]=1/(1+sm)
+  fm/=r
+  for i in range(r+1):
+    fm[i,i]=1-(sum(fm[i])-fm[i,i])
+  return fm
+
+def reference_cooperation_index(num_agents,e_a,e_r,g,r,donate_util,recieve_util,beta):
+  """The original cooperation_index, summing the donation probability of every pair of images in every tuple"""
+  sum=0
+  p=generosity.powermethod(reference_strat_transition_matrix(num_agents,e_a,e_r,g,r,donate_util,recieve_util,beta))
+  for i in range(len(p)):
+    tm=reference_transition_matrix(num_agents,0,i,0,e_a,e_r,g,r)
+    vec=generosity.stationary_distribution(tm,"deeptime" if generosity.MarkovStateModel is not None else "dense")
+    (index_to_tuple,tuple_to_index)=make_index(list(generosity.make_indices(r,num_agents,0)))
+    for j in range(len(vec)):
+      current_tuple=index_to_tuple[j][0]
+      for donor in range(len(current_tuple)):
+        for recipient in range(len(current_tuple)):
+          if donor!=recipient:
+            prob_play=current_tuple[donor]*current_tuple[recipient]/(num_agents*(num_agents-1))
+          else:
+            prob_play=(current_tuple[donor]**2-current_tuple[donor])/(num_agents*(num_agents-1))
+          sum+=generosity.prob_donate(i,recipient,e_a,e_r,g,r)*prob_play*vec[j]*p[i]
+  return sum
+
+def cross_check(num_agents,r):
+  """Returns the largest absolute differences between the engine and the reference implementation"""
+  k=num_agents//2
+  checks={}
+  tm=generosity.make_transition_matrix(k,num_agents-k,1,r,E_A,E_R,G,r)
+  checks["transition_matrix"]=float(np.abs(tm-reference_transition_matrix(k,num_agents-k,1,r,E_A,E_R,G,r)).max())
+  u=generosity.compute_utility(k,num_agents-k,1,r,E_A,E_R,G,r,DONATE_UTIL,RECIEVE_UTIL)
+  ref=reference_compute_utility(k,num_agents-k,1,r,E_A,E_R,G,r,DONATE_UTIL,RECIEVE_UTIL)
+  checks["compute_utility"]=max(abs(float(u[s]-ref[s])) for s in (1,r))
+  generosity.clear_chain_cache()
+  stm=generosity.strat_transition_matrix(num_agents,E_A,E_R,G,r,DONATE_UTIL,RECIEVE_UTIL,BETA)
+  checks["strat_transition_matrix"]=float(np.abs(stm-reference_strat_transition_matrix(num_agents,E_A,E_R,G,r,DONATE_UTIL,RECIEVE_UTIL,BETA)).max())
+  return checks
+
+def benchmark(num_agents,r,repeat=1,processes=1):
+  """Times each stage of the engine for one (N, R) and returns the measurements as a dict"""
+  k=num_agents//2 #the largest two strategy chain
+  result={"num_agents":num_agents,"r":r,
+          "single_strategy_states":generosity.composition_count(num_agents,r),
+          "largest_chain_states":generosity.composition_count(k,r)*generosity.composition_count(num_agents-k,r),
+          "chains_per_evaluation":(r+1)*r//2*(num_agents-1)+(r+1),
+          "seconds":{}}
+  seconds=result["seconds"]
+  (_,seconds["make_indices"])=timed(lambda: list(generosity.make_indices(r,k,num_agents-k)),repeat=repeat)
+  (tm,seconds["make_transition_matrix"])=timed(generosity.make_sparse_transition_matrix,k,num_agents-k,1,r,E_A,E_R,G,r,repeat=repeat)
+  (_,seconds["powermethod"])=timed(generosity.powermethod,tm,repeat=repeat)
+  (_,seconds["compute_utility"])=timed(generosity.compute_utility,k,num_agents-k,1,r,E_A,E_R,G,r,DONATE_UTIL,RECIEVE_UTIL,repeat=repeat)
+  (_,seconds["strat_transition_matrix"])=timed(generosity.strat_transition_matrix,num_agents,E_A,E_R,G,r,DONATE_UTIL,RECIEVE_UTIL,BETA,processes,repeat=repeat)
+  (ci,seconds["cooperation_index"])=timed(generosity.cooperation_index,num_agents,E_A,E_R,G,r,DONATE_UTIL,RECIEVE_UTIL,BETA,processes,repeat=repeat)
+  result["cooperation_index"]=ci
+  result["peak_rss_mb"]=peak_rss_mb()
+  if result["largest_chain_states"]<=CHECK_MAX_STATES and num_agents<=4:
+    result["max_abs_error"]=cross_check(num_agents,r)
+  return result
+
+def isolated_benchmark(num_agents,r,repeat=1,processes=1):
+  """benchmark() in a freshly spawned interpreter, so that its peak_rss_mb is the peak of this size alone rather than of
+  every size measured before it (ru_maxrss never decreases, and a forked child starts from its parent's peak)"""
+  with ProcessPoolExecutor(1,mp_context=multiprocessing.get_context("spawn")) as pool:
+    return pool.submit(benchmark,num_agents,r,repeat,processes).result()
+
+def parse_sizes(sizes):
+  """Parses "3x3,4x4" into [(3,3),(4,4)]"""
+  return [tuple(int(v) for v in size.split("x")) for size in sizes.split(",")]
+
+def main():
+  parser=argparse.ArgumentParser(description="Benchmark the generosity analysis engine")
+  parser.add_argument("--sizes",default=DEFAULT_SIZES,help=f"Comma separated NxR sizes (default: {DEFAULT_SIZES})")
+  parser.add_argument("--repeat",type=int,default=1,help="Number of timing repetitions, the best is reported")
+  parser.add_argument("--processes",type=int,default=1,help="Processes for strat_transition_matrix")
+  parser.add_argument("--output",default="benchmark.json",help="JSON file to write the results to")
+  args=parser.parse_args()
+
+  results=[]
+  for (num_agents,r) in parse_sizes(args.sizes):
+    result=isolated_benchmark(num_agents,r,args.repeat,args.processes)
+    results.append(result)
+    print(f"N={num_agents} R={r}: {result['largest_chain_states']} states, cooperation index {result['cooperation_index']:.6f}, "
+          f"{result['seconds']['cooperation_index']:.3f}s, peak RSS {result['peak_rss_mb']:.0f}MB")
+    if "max_abs_error" in result:
+      print(f"  max abs error vs reference: {result['max_abs_error']}")
+
+  with open(args.output,"w") as f:
+    json.dump({"time":time.strftime("%Y-%m-%dT%H:%M:%S"),"python":platform.python_version(),"numpy":np.__version__,"results":results},f,indent=2)
+  print(f"Results written to {args.output}")
+
+if __name__=="__main__":
+  main()
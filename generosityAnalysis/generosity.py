@@ -1,51 +1,94 @@
-#!pip install deeptime
+#!pip install deeptime #optional, only needed for stationary_distribution(m,"deeptime")
 
 import numpy as np
 import math
+import functools
 import itertools
+import multiprocessing
+import os
 import sys
-from deeptime.markov.msm import MarkovStateModel
-
-def array_expand(array_set): 
-  """creates tuples with the possible combinations of tuples expecting array_set[0] to be the number of agents in the tuple. Example usage: `array_expand(set([tuple(5,0,0,0)]))`"""
-  add=set()
-  finished=False
-  while not finished:
-    finished=True
-    for a in array_set:
-      for j in range(len(a)-1):
-        if a[j]!=0:
-          b=list(a)
-          b[j]-=1
-          b[j+1]+=1
-          b=tuple(b)
-          if b not in add and b not in array_set:
-            add.add(b)
-            finished=False
-    array_set.update(add)
-  return array_set
+from collections import OrderedDict
+import scipy.sparse
+import scipy.sparse.csgraph
+import scipy.sparse.linalg
+import warnings
+try:
+  from deeptime.markov.msm import MarkovStateModel
+except ImportError:
+  MarkovStateModel=None
+
+def composition_count(num_agents,num_rep):
+  """The number of ways of allocating num_agents agents to num_rep reputation values (stars and bars)"""
+  return math.comb(num_agents+num_rep-1,num_rep-1)
+
+def compositions(num_agents,num_rep):
+  """Generates all allocations of num_agents agents to num_rep reputation values in rank order, i.e., in decreasing lexicographic order
+     starting from (num_agents,0,...,0)."""
+  if num_rep==1:
+    yield (num_agents,)
+    return
+  for first in range(num_agents,-1,-1):
+    for rest in compositions(num_agents-first,num_rep-1):
+      yield (first,)+rest
+
+def rank_composition(c):
+  """Returns the position of allocation c in the order produced by compositions. Every allocation whose first i values match c and whose
+     (i+1)th value is larger comes before c; there are comb(m-c_i+R-i-2,R-i-1) of these, with m the agents not allocated to the first i values."""
+  num_rep=len(c)
+  remaining=sum(c)
+  rank=0
+  for i in range(num_rep-1):
+    rank+=math.comb(remaining-c[i]+num_rep-i-2,num_rep-i-1)
+    remaining-=c[i]
+  return rank
+
+def unrank_composition(rank,num_agents,num_rep):
+  """Inverse of rank_composition: returns the allocation of num_agents agents to num_rep reputation values at position rank"""
+  c=[]
+  remaining=num_agents
+  for i in range(num_rep-1):
+    #choose the largest value whose block of allocations still starts at or before rank
+    v=remaining
+    while rank>=composition_count(remaining-v,num_rep-i-1):
+      rank-=composition_count(remaining-v,num_rep-i-1)
+      v-=1
+    c.append(v)
+    remaining-=v
+  c.append(remaining)
+  return tuple(c)
+
+@functools.lru_cache(maxsize=None)
+def _binomial_table(rows,cols):
+  return np.array([[math.comb(a,b) for b in range(cols)] for a in range(rows)],dtype=np.int64)
+
+def rank_compositions(rows,num_agents):
+  """Array version of rank_composition for a (k, R) int array of allocations of num_agents agents"""
+  num_rep=rows.shape[1]
+  binom=_binomial_table(num_agents+num_rep,num_rep)
+  remaining=num_agents-np.cumsum(rows,axis=1)+rows #agents not allocated to the preceding values
+  rank=np.zeros(len(rows),dtype=np.int64)
+  for i in range(num_rep-1):
+    rank+=binom[remaining[:,i]-rows[:,i]+num_rep-i-2,num_rep-i-1]
+  return rank
+
+def half_indices(num_rep,num_agents):
+  """Returns a list of all the allocations of num_agents agents to num_rep reputation values, i.e., one half of the tuple pairs produced by make_indices"""
+  return list(compositions(num_agents,num_rep))
 
 def make_indices(num_rep,num_s1,num_s2):
-  """This function splits agents to all possible allocations. E.g., make_indices(6,3,2) will allocate the 3 agents to all possible 6 reputation values in the first tuple and 2 agents to all possible reputation values in the second."""  
-  s1a=[0]*num_rep
-  s2a=[0]*num_rep
-  s1a[0]=num_s1
-  s2a[0]=num_s2
-  i1=array_expand(set([tuple(s1a)]))
-  i2=array_expand(set([tuple(s2a)]))
-  return itertools.product(i1,i2)
-
-
-def make_index(array_set): 
-  """A simple caching function which allows one to map from ints to tuple pairs and back. returns d,r where d[i] takes an index and returns a tuple and r[a] takes a tuple and returns the index"""
-  i=0
-  d={}
-  r={}
-  for a in array_set:
-    d[i]=a
-    r[a]=i
-    i+=1
-  return (d,r)
+  """This function splits agents to all possible allocations. E.g., make_indices(6,3,2) will allocate the 3 agents to all possible 6 reputation values in the first tuple and 2 agents to all possible reputation values in the second.
+     Tuple pairs come out in a fixed order: the pair (n,m) is at index rank_composition(n)*composition_count(num_s2,num_rep)+rank_composition(m)."""  
+  return itertools.product(compositions(num_s1,num_rep),compositions(num_s2,num_rep))
+
+def make_index_arrays(num_rep,num_s1,num_s2):
+  """Array version of make_indices. Returns (states,index_of) where states is a (len(tuples), 2*num_rep) int array whose row i is
+     the concatenation n+m of the i-th tuple pair, and index_of maps a (k, 2*num_rep) array of such rows back to their indices by ranking each half."""
+  i1=np.array(half_indices(num_rep,num_s1),dtype=np.int64)
+  i2=np.array(half_indices(num_rep,num_s2),dtype=np.int64)
+  states=np.concatenate([np.repeat(i1,len(i2),axis=0),np.tile(i2,(len(i1),1))],axis=1)
+  def index_of(rows):
+    return rank_compositions(rows[:,:num_rep],num_s1)*len(i2)+rank_compositions(rows[:,num_rep:],num_s2)
+  return (states,index_of)
 
 def increase_image(tup,image_index):
   """decreases the image at the current image_index, increases it at the next one, unless we're at maximum. Imageindex is an integer between 0 and 2*R-1, i.e., goes across the pair"""
@@ -77,10 +120,116 @@ def decrease_image(tup,image_index):
     m[image_index-len(n)-1]+=1
   return (tuple(n),tuple(m))
 
+DENSE_SOLVER_MAX_STATES=400 #chains up to this size are solved densely by the "auto" method
+STATIONARY_TOLERANCE=1e-10 #maximum L1 residual |pi P - pi| accepted from a solver
+STATIONARY_METHODS=("auto","dense","splu","gmres","power","deeptime")
+
+def _balance_system(m):
+  """Returns (a,b) such that a pi = b are the balance equations pi(P-I)=0, with the last (linearly dependent) one replaced by sum(pi)=1"""
+  n=m.shape[0]
+  a=(scipy.sparse.csr_matrix(m)-scipy.sparse.identity(n,format="csr")).T.tolil()
+  a[n-1,:]=np.ones(n)
+  b=np.zeros(n)
+  b[n-1]=1
+  return (a.tocsc(),b)
+
+def _normalise(vec):
+  vec=np.maximum(np.real(vec),0) #clip round-off noise on transient states
+  return vec/vec.sum()
+
+def stationary_residual(m,vec):
+  """The L1 norm of vec P - vec, used to check the accuracy of a stationary distribution"""
+  return np.abs(m.T@vec-vec).sum()
+
+def sparse_stationary_distribution(m):
+  """Computes the stationary distribution of a sparse transition matrix by solving the balance equations with a sparse LU decomposition"""
+  (a,b)=_balance_system(m)
+  return _normalise(scipy.sparse.linalg.spsolve(a,b))
+
+def dense_stationary_distribution(m):
+  """Solves the balance equations with a dense LU decomposition, which is fastest for small chains"""
+  m=m.toarray() if scipy.sparse.issparse(m) else np.asarray(m)
+  n=len(m)
+  a=(m-np.identity(n)).T
+  a[n-1,:]=1
+  b=np.zeros(n)
+  b[n-1]=1
+  return _normalise(np.linalg.solve(a,b))
+
+def gmres_stationary_distribution(m,x0=None,tol=STATIONARY_TOLERANCE):
+  """Solves the balance equations iteratively with GMRES, starting from x0 if given (e.g., the solution at a neighbouring parameter point)"""
+  (a,b)=_balance_system(m)
+  (vec,info)=scipy.sparse.linalg.gmres(a,b,x0=x0,rtol=tol*1e-2,atol=0,restart=min(100,len(b)),maxiter=1000)
+  return _normalise(vec)
+
+def power_stationary_distribution(m,x0=None,tol=STATIONARY_TOLERANCE,max_iter=100000):
+  """A true power iteration, starting from x0 if given and from the uniform distribution otherwise. The lazy chain (P+I)/2 is iterated,
+     which has the same stationary distribution but cannot oscillate on periodic chains."""
+  mt=m.T.tocsr() if scipy.sparse.issparse(m) else np.asarray(m).T
+  vec=np.full(m.shape[0],1/m.shape[0]) if x0 is None else _normalise(x0)
+  for _ in range(max_iter):
+    step=mt@vec
+    if np.abs(step-vec).sum()<=tol:
+      return _normalise(step)
+    vec=(vec+step)/2
+  return _normalise(vec)
+
+def closed_class_count(m):
+  """The number of closed communicating classes of the chain m, i.e., of its stationary distributions that cannot be mixed from others"""
+  m=scipy.sparse.csr_matrix(m,copy=True)
+  m.eliminate_zeros()
+  (n,labels)=scipy.sparse.csgraph.connected_components(m,directed=True,connection="strong")
+  (rows,cols)=m.nonzero()
+  leaving=labels[rows]!=labels[cols]
+  return n-len(np.unique(labels[rows[leaving]]))
+
+def _accurate(m,vec,tol):
+  """True if vec is finite and its residual is within tol (a NaN residual fails the comparison)"""
+  return bool(np.all(np.isfinite(vec))) and stationary_residual(m,vec)<=tol
+
+def stationary_distribution(m,method="auto",x0=None,tol=STATIONARY_TOLERANCE):
+  """Computes the stationary distribution of the dense or sparse transition matrix m with the given method (one of STATIONARY_METHODS).
+     "auto" solves small chains densely and larger ones with sparse LU. x0 is a warm start for the iterative methods.
+     A chain with more than one closed class (e.g., a zero-noise chain with g=0) has more than one stationary distribution and singular
+     balance equations, so it is solved by power iteration from the uniform distribution whatever the method: the long run distribution
+     from a uniformly random state, which does not depend on the order of the states. The same is used if a solver fails or returns a
+     non-finite vector. If the result's residual exceeds tol it is refined by power iteration from that result, with a warning if it
+     still does not converge."""
+  if method=="auto":
+    method="dense" if m.shape[0]<=DENSE_SOLVER_MAX_STATES else "splu"
+  if method not in STATIONARY_METHODS:
+    raise ValueError(f"unknown stationary distribution method {method}, expected one of {STATIONARY_METHODS}")
+  if method=="deeptime" and MarkovStateModel is None:
+    raise ImportError("the deeptime method requires the deeptime package (pip install deeptime)")
+  if closed_class_count(m)>1:
+    vec=power_stationary_distribution(m,None,tol)
+  else:
+    try:
+      with warnings.catch_warnings():
+        warnings.simplefilter("ignore",scipy.sparse.linalg.MatrixRankWarning) #spsolve warns and returns NaN on a singular system
+        if method=="dense":
+          vec=dense_stationary_distribution(m)
+        elif method=="splu":
+          vec=sparse_stationary_distribution(m)
+        elif method=="gmres":
+          vec=gmres_stationary_distribution(m,x0,tol)
+        elif method=="power":
+          vec=power_stationary_distribution(m,x0,tol)
+        else:
+          vec=MarkovStateModel(m.toarray() if scipy.sparse.issparse(m) else m).stationary_distribution
+    except (np.linalg.LinAlgError,RuntimeError): #RuntimeError is raised by splu on an exactly singular matrix
+      vec=None
+    if vec is None or not np.all(np.isfinite(vec)):
+      vec=power_stationary_distribution(m,None,tol)
+  if not _accurate(m,vec,tol):
+    vec=power_stationary_distribution(m,vec if np.all(np.isfinite(vec)) else None,tol)
+    if not _accurate(m,vec,tol):
+      warnings.warn(f"stationary distribution residual {stationary_residual(m,vec)} exceeds tolerance {tol}")
+  return vec
+
 def powermethod(m):
-  """Use the power method to compute the dominant eigenvector"""
-  t=MarkovStateModel(m)
-  return t.stationary_distribution
+  """Computes the stationary distribution (the dominant left eigenvector) of m, see stationary_distribution"""
+  return stationary_distribution(m)
 
 def prob_donate(s_d,i_r,e_a,e_r,g,r):
   #small speedup: recalculate terms used multiple times, namely (r-s_d/r)
@@ -129,15 +278,67 @@ def compute_transitions(tup,s1,s2,e_a,e_r,g):
       probabilities[no_donate_tuple]=(1-p_donate)*prob_play+probabilities.get(no_donate_tuple,0)
   return probabilities
 
+def donation_matrix(s1,s2,e_a,e_r,g,r):
+  """Returns the (2R, 2R) matrix of prob_donate values, where entry [donor,recipient] is the likelihood that an agent at donor index
+     (strategy s1 for the first R indices, s2 for the rest) donates to an agent at recipient index, i.e., with image recipient%R."""
+  pd=np.zeros([2*r,2*r])
+  for donor in range(2*r):
+    strat=s1 if donor<r else s2
+    for recipient in range(2*r):
+      pd[donor,recipient]=prob_donate(strat,recipient%r,e_a,e_r,g,r)
+  return pd
+
+def batch_donations(states,pd):
+  """Takes a (S, 2R) array of states and the donation_matrix, and returns a pair (give,get) of (S, 2R) arrays. give[i,d] is the likelihood that
+     the donor in state i is at index d and donates (summed over recipients), get[i,d] the likelihood that the recipient is at d and receives a donation.
+     The likelihood of playing is c_d*c_r/(N(N-1)) for distinct indices and (c_d^2-c_d)/(N(N-1)) otherwise, as in compute_transitions."""
+  num_agents=states[0].sum()
+  norm=num_agents*(num_agents-1)
+  give=states*(states@pd.T-np.diag(pd))/norm
+  get=states*(states@pd-np.diag(pd))/norm
+  return (give,get)
+
+def batch_tuple_utility(states,s1,s2,donate_util,recieve_util,e_a,e_r,g):
+  """Array version of tuple_utility. Returns (u1,u2), the utility of the s1 and s2 agents in each of the (S, 2R) states."""
+  r=states.shape[1]//2
+  (give,get)=batch_donations(states,donation_matrix(s1,s2,e_a,e_r,g,r))
+  u1=give[:,:r].sum(axis=1)*donate_util+get[:,:r].sum(axis=1)*recieve_util
+  u2=give[:,r:].sum(axis=1)*donate_util+get[:,r:].sum(axis=1)*recieve_util
+  return (u1,u2)
+
+def make_sparse_transition_matrix(num_s1,num_s2,s1,s2,e_a,e_r,g,r):
+  """Builds the transition matrix as a scipy CSR matrix. Each tuple only has at most 2*(2R) successors, so rather than allocating a dense
+     len(tuples) x len(tuples) array we collect flat (row, column, probability) arrays and let COO->CSR conversion sum any duplicate entries.
+     All states are handled at once: the donor at index d moves one agent up an image when donating and down one otherwise, staying put at the ends of its half."""
+  (states,index_of)=make_index_arrays(r,num_s1,num_s2)
+  num_states=len(states)
+  (give,_)=batch_donations(states,donation_matrix(s1,s2,e_a,e_r,g,r))
+  num_agents=num_s1+num_s2
+  play=states/num_agents #the likelihood that the donor is at index d
+  rows=[]
+  cols=[]
+  vals=[]
+  for d in range(2*r):
+    present=np.nonzero(states[:,d])[0]
+    for (step,probs) in ((1,give[present,d]),(-1,play[present,d]-give[present,d])):
+      if (step==1 and d%r==r-1) or (step==-1 and d%r==0):
+        succ=present
+      else:
+        moved=states[present].copy()
+        moved[:,d]-=1
+        moved[:,d+step]+=1
+        succ=index_of(moved)
+      rows.append(present)
+      cols.append(succ)
+      vals.append(probs)
+  rows=np.concatenate(rows)
+  cols=np.concatenate(cols)
+  vals=np.concatenate(vals)
+  return scipy.sparse.coo_matrix((vals,(rows,cols)),shape=(num_states,num_states)).tocsr()
+
 def make_transition_matrix(num_s1,num_s2,s1,s2,e_a,e_r,g,r):
-  tuples=list(make_indices(r,num_s1,num_s2))
-  (index_to_tuple,tuple_to_index)=make_index(tuples)
-  transition_matrix=np.zeros([len(tuples),len(tuples)])
-  for t in tuples:
-    transition_probs=compute_transitions(t,s1,s2,e_a,e_r,g)
-    for p in transition_probs:
-      transition_matrix[tuple_to_index[t],tuple_to_index[p]]=transition_probs[p]
-  return transition_matrix   
+  """Dense version of make_sparse_transition_matrix, kept for small chains and interactive use."""
+  return make_sparse_transition_matrix(num_s1,num_s2,s1,s2,e_a,e_r,g,r).toarray()
 
 def tuple_utility(tup,s1,s2,donate_util,recieve_util,e_a,e_r,g):
   """this returns a pair of utilities for each strategy by considering the likelihood that a pair of agents play each other and multiplying that by the likelihood of donating and the payoff for donating"""
@@ -172,80 +373,131 @@ def tuple_utility(tup,s1,s2,donate_util,recieve_util,e_a,e_r,g):
       util[strat2]+=p_donate*prob_play*recieve_util
   return util
 
+CHAIN_CACHE_SIZE=4096 #maximum number of stationary distributions kept in memory
+STATIONARY_METHOD="auto" #the stationary_distribution method used for reputation chains
+_chain_cache=OrderedDict()
+_chain_cache_dir=None
+_warm_starts={}
+
+def set_chain_cache_dir(path):
+  """Persists solved chains as .npz files in path so that they can be shared between processes and reused across runs. Pass None to disable."""
+  global _chain_cache_dir
+  if path is not None:
+    os.makedirs(path,exist_ok=True)
+  _chain_cache_dir=path
+
+def clear_chain_cache():
+  """Empties the in-memory chain cache (files in the cache directory are left alone)"""
+  _chain_cache.clear()
+
+def _chain_cache_file(key):
+  return os.path.join(_chain_cache_dir,"chain_"+"_".join(repr(k) for k in key)+".npz")
+
+def solve_chain(num_s1,num_s2,s1,s2,e_a,e_r,g,r):
+  """Returns the stationary distribution of the reputation chain for num_s1 agents playing s1 and num_s2 playing s2.
+     The same chain is needed many times over by strat_transition_matrix, so solutions are kept in a bounded LRU cache and optionally on disk."""
+  #the chain for (num_s2,num_s1,s2,s1) is the same chain with the two halves of every tuple pair swapped, so only one of them is solved
+  if num_s1==0:
+    s1=0
+  if num_s2==0:
+    s2=0 #the strategy of an empty half does not matter
+  if (num_s1,s1)>(num_s2,s2):
+    mirrored=solve_chain(num_s2,num_s1,s2,s1,e_a,e_r,g,r)
+    return mirrored.reshape(composition_count(num_s2,r),composition_count(num_s1,r)).T.ravel()
+  key=(num_s1,num_s2,s1,s2,e_a,e_r,g,r)
+  if key in _chain_cache:
+    _chain_cache.move_to_end(key)
+    return _chain_cache[key]
+  vec=None
+  if _chain_cache_dir is not None and os.path.exists(_chain_cache_file(key)):
+    with np.load(_chain_cache_file(key)) as f:
+      vec=f["vec"]
+  if vec is None:
+    #the iterative solvers are warm started from the last chain solved with the same shape, e.g., at a neighbouring e_a, e_r or g
+    shape=(num_s1,num_s2,r)
+    vec=stationary_distribution(make_sparse_transition_matrix(num_s1,num_s2,s1,s2,e_a,e_r,g,r),STATIONARY_METHOD,_warm_starts.get(shape))
+    _warm_starts[shape]=vec
+    if _chain_cache_dir is not None:
+      #write then rename so that concurrent workers never read a partial file
+      tmp=_chain_cache_file(key)[:-4]+f".{os.getpid()}.tmp.npz"
+      np.savez(tmp,vec=vec)
+      os.replace(tmp,_chain_cache_file(key))
+  _chain_cache[key]=vec
+  if len(_chain_cache)>CHAIN_CACHE_SIZE:
+    _chain_cache.popitem(last=False)
+  return vec
+
 def compute_utility(num_s1,num_s2,s1,s2,e_a,e_r,g,r,donate_util,recieve_util):
   "computes the utility for a specific distribution of s1 and s2 strategies across all tuples with that number"
-  tm=make_transition_matrix(num_s1,num_s2,s1,s2,e_a,e_r,g,r)
-  #ei=eig(tm,left=True,right=True)[2][0]
-  vec=powermethod(tm)
+  vec=solve_chain(num_s1,num_s2,s1,s2,e_a,e_r,g,r)
   #so vec contains the probabilities of the tuple arising. What is the expected utility of the tuple playing each other?
+  (states,_)=make_index_arrays(r,num_s1,num_s2)
+  (u1,u2)=batch_tuple_utility(states,s1,s2,donate_util,recieve_util,e_a,e_r,g)
   util={s1:0,s2:0}
-  tuples=list(make_indices(r,num_s1,num_s2))
-  (index_to_tuple,tuple_to_index)=make_index(tuples)
-  for i in range(len(vec)):
-    t=index_to_tuple[i]
-    u=tuple_utility(t,s1,s2,donate_util,recieve_util,e_a,e_r,g)
-    util[s1]+=u[s1]*vec[i]
-    util[s2]+=u[s2]*vec[i]
+  util[s1]+=vec@u1
+  util[s2]+=vec@u2
   return util
 
-def strat_transition_matrix(num_agents,e_a,e_r,g,r,donate_util,recieve_util,beta):
+def _fixation_from_exponents(exponents):
+  """Returns 1/(1+sum_na prod_{k<=na} exp(exponents[k])). The products are kept as a running sum of exponents, with the final sum taken as a
+     log-sum-exp so that large beta does not overflow."""
+  log_products=np.cumsum(exponents) #log of the product for each na
+  return math.exp(-np.logaddexp.reduce(np.concatenate([[0],log_products])))
+
+def fixation_probabilities(num_agents,s1,s2,e_a,e_r,g,r,donate_util,recieve_util,beta):
+  """Returns the fixation probabilities 1/(1+sum_na prod_{k<=na} exp(-beta*(us2(k)-us1(k)))) of s2 among s1 and of s1 among s2. With k agents
+     playing s2 and N-k playing s1, the utilities are those of the s1,s2 chain with N-k s1 agents, so both directions are computed from the same
+     N-1 utility evaluations."""
+  us1=np.zeros(num_agents+1)
+  us2=np.zeros(num_agents+1)
+  for k in range(1,num_agents):
+    u=compute_utility(k,num_agents-k,s1,s2,e_a,e_r,g,r,donate_util,recieve_util)
+    us1[k]=u[s1]
+    us2[k]=u[s2]
+  k=np.arange(1,num_agents)
+  forward=_fixation_from_exponents(-beta*(us2[k]-us1[k])) #faster than calling fermi_learning, constant is the beta parameter in fermi
+  backward=_fixation_from_exponents(-beta*(us1[num_agents-k]-us2[num_agents-k]))
+  return (forward,backward)
+
+def _pair_fixation(task):
+  """Pool worker for strat_transition_matrix: task is (i,j,args) with i<j and the result (i,j,fm[i,j],fm[j,i])"""
+  (i,j,args)=task
+  (num_agents,e_a,e_r,g,r,donate_util,recieve_util,beta)=args
+  return (i,j)+fixation_probabilities(num_agents,i,j,e_a,e_r,g,r,donate_util,recieve_util,beta)
+
+def strat_transition_matrix(num_agents,e_a,e_r,g,r,donate_util,recieve_util,beta,processes=1):
+  """Builds the (r+1)x(r+1) matrix of transitions between single strategy states. Each unordered pair of strategies is an independent task which
+     fills in both fm[i,j] and fm[j,i] from the same chains; with processes>1 (or None for all cores) the tasks are handed out one at a time to a
+     process pool, so idle workers pick up the remaining pairs."""
   fm=np.zeros([r+1,r+1])
-  for i in range(r+1):
-    for j in range(r+1):
-      s1=i
-      s2=j
-      sm=0
-      for na in range(1,num_agents):
-        tmp=1
-        for k in range(1,na+1):
-          u=compute_utility(k,num_agents-k,s1,s2,e_a,e_r,g,r,donate_util,recieve_util)
-          us1=u[s1]
-          us2=u[s2]
-          
-          tmp*=math.exp(-beta*(us2-us1)) #faster than calling fermi_learning, constant is the beta parameter in fermi
-        sm+=tmp
-      fixation=1/(1+sm)
-      fm[i,j]=fixation
+  args=(num_agents,e_a,e_r,g,r,donate_util,recieve_util,beta)
+  tasks=[(i,j,args) for i in range(r+1) for j in range(i+1,r+1)] #the diagonal is overwritten below
+  if processes==1:
+    results=list(map(_pair_fixation,tasks))
+  else:
+    with multiprocessing.Pool(processes) as pool:
+      results=list(pool.imap_unordered(_pair_fixation,tasks,chunksize=1))
+  for (i,j,forward,backward) in results:
+    fm[i,j]=forward
+    fm[j,i]=backward
   fm/=r    
   for i in range(r+1):
     fm[i,i]=1-(sum(fm[i])-fm[i,i])
   return fm
 
-def cooperation_index(num_agents,e_a,e_r,g,r,donate_util,recieve_util,beta):
+def cooperation_index(num_agents,e_a,e_r,g,r,donate_util,recieve_util,beta,processes=1):
   """The cooperation index is calculated as the likelihood of ending up in a single agent state (c.f., the strat_transition_matrix)
-     times the likelihood of having some distribution of images in that state times the likelihood that an agent will donate in that state."""
+     times the likelihood of having some distribution of images in that state times the likelihood that an agent will donate in that state.
+     processes is passed on to strat_transition_matrix."""
   sum=0
-  stm=strat_transition_matrix(num_agents,e_a,e_r,g,r,donate_util,recieve_util,beta)
+  stm=strat_transition_matrix(num_agents,e_a,e_r,g,r,donate_util,recieve_util,beta,processes)
   p=powermethod(stm)
   #print(f"fixation probabilities: {p}")
   for i in range(len(p)):
-    tm=make_transition_matrix(num_agents,0,i,0,e_a,e_r,g,r) #we can consider all agents being in the first tuple.
-    vec=powermethod(tm)
-    tuples=list(make_indices(r,num_agents,0))
-    (index_to_tuple,tuple_to_index)=make_index(tuples)
-    for j in range(len(vec)):
-      current_tuple=index_to_tuple[j][0]
-      probability_of_tuple=vec[j]
-      #if probability_of_tuple>0.01:
-      #  print(f"{i} prob: {probability_of_tuple} tuple: {index_to_tuple[j][0]}")
-      for donor in range(len(current_tuple)):
-        for recipient in range(len(current_tuple)):
-          if current_tuple[donor]==0 or current_tuple[recipient]==0:
-            continue 
-          prob_play=0
-          if donor!=recipient:
-            prob_play=current_tuple[donor]*current_tuple[recipient]/(num_agents*(num_agents-1))
-          else:
-            prob_play=(current_tuple[donor]**2-current_tuple[donor])/(num_agents*(num_agents-1))
-
-          image1=donor
-          image2=recipient
-
-          p_donate=prob_donate(i,image2,e_a,e_r,g,r)
-          #if p_donate*prob_play*probability_of_tuple*p[i]>1e-18:
-          #  print(f"d: {donor}, r: {recipient} pp: {prob_play} pd: {p_donate} p_t: {probability_of_tuple} i: {i} pi: {p[i]} res:{p_donate*prob_play*probability_of_tuple*p[i]}")
-
-          sum+=p_donate*prob_play*probability_of_tuple*p[i]
+    vec=solve_chain(num_agents,0,i,0,e_a,e_r,g,r) #we can consider all agents being in the first tuple.
+    (states,_)=make_index_arrays(r,num_agents,0)
+    (donation_rate,_)=batch_tuple_utility(states,i,0,1,0,e_a,e_r,g) #a donation is worth 1 to the donor and nothing to the recipient
+    sum+=(vec@donation_rate)*p[i]
   return sum  
 
 #######################################
@@ -290,8 +542,6 @@ lines_dict = OrderedDict(
      ('8', (0, (5, 1))),
      ('9', (0, (3, 1, 1, 1)))])
 
-import multiprocessing
-
 
 
 def evalpoint(x):
@@ -299,13 +549,14 @@ def evalpoint(x):
 
 
 if __name__=="__main__":
+  set_chain_cache_dir("chain_cache")
   fig=plt.figure()
   plt.xlim(1.9,8.1)
   plt.ylim(-0.02,1.02)
   #xpoints = [0.0, 0.025, 0.05, 0.075, 0.1, 0.125, 0.15, 0.175, 0.2]
   xpoints = [2, 3, 4, 5, 6, 7,8]
-  pool=multiprocessing.Pool()
-  ret=pool.map(evalpoint,xpoints)
+  with multiprocessing.Pool() as pool:
+    ret=pool.map(evalpoint,xpoints)
   print(ret)
   #so ret now contains an array of arrays
 
@@ -0,0 +1,90 @@
+"""Runs cooperation_index over a grid of parameters, storing each point in an SQLite database as soon as it is computed.
+
+Points already in the database are skipped, so an interrupted sweep can simply be restarted. Example spec file:
+
+  {"num_agents": [2, 3, 4, 5, 6, 7, 8], "e_a": [0.025], "e_r": [0.025], "g": [0, 0.01, 0.05],
+   "r": [4], "donate_util": [-0.1], "recieve_util": [1.0], "beta": [10]}
+
+Usage: `python sweep.py spec.json --store results.sqlite`
+"""
+
+import argparse
+import itertools
+import json
+import multiprocessing
+import sqlite3
+
+import generosity
+
+#parameters in the order taken by generosity.cooperation_index
+PARAMS=("num_agents","e_a","e_r","g","r","donate_util","recieve_util","beta")
+INT_PARAMS=("num_agents","r")
+
+def expand_grid(spec):
+  """Takes a dict mapping each of PARAMS to a value or list of values and returns the sorted list of distinct parameter tuples"""
+  missing=[p for p in PARAMS if p not in spec]
+  if missing:
+    raise ValueError(f"sweep spec is missing {', '.join(missing)}")
+  axes=[]
+  for p in PARAMS:
+    values=spec[p] if isinstance(spec[p],list) else [spec[p]]
+    cast=int if p in INT_PARAMS else float #so that e.g. 0 and 0.0 are the same point
+    axes.append([cast(v) for v in values])
+  return sorted(set(itertools.product(*axes)))
+
+def open_store(path):
+  """Opens (creating if needed) the results database. Each row is one grid point and its cooperation index."""
+  conn=sqlite3.connect(path)
+  columns=", ".join(f"{p} {'INTEGER' if p in INT_PARAMS else 'REAL'} NOT NULL" for p in PARAMS)
+  conn.execute(f"CREATE TABLE IF NOT EXISTS results ({columns}, cooperation_index REAL NOT NULL, PRIMARY KEY ({', '.join(PARAMS)}))")
+  conn.commit()
+  return conn
+
+def done_points(conn):
+  """The set of parameter tuples already in the store"""
+  return set(conn.execute(f"SELECT {', '.join(PARAMS)} FROM results"))
+
+def load_results(path):
+  """Returns the stored results as a list of dicts with the PARAMS and cooperation_index as keys"""
+  conn=open_store(path)
+  rows=conn.execute(f"SELECT {', '.join(PARAMS)}, cooperation_index FROM results ORDER BY {', '.join(PARAMS)}").fetchall()
+  conn.close()
+  return [dict(zip(PARAMS+("cooperation_index",),row)) for row in rows]
+
+def _init_worker(chain_cache):
+  if chain_cache is not None:
+    generosity.set_chain_cache_dir(chain_cache)
+
+def _evaluate(point):
+  return (point,generosity.cooperation_index(*point))
+
+def run_sweep(spec,store,processes=None,chain_cache=None):
+  """Evaluates every grid point of spec that is not yet in store on a pool of processes (None for all cores), committing each result as it arrives.
+     chain_cache is an optional directory passed to generosity.set_chain_cache_dir in every worker. Returns the number of points computed."""
+  conn=open_store(store)
+  done=done_points(conn)
+  pending=[p for p in expand_grid(spec) if p not in done]
+  if pending:
+    with multiprocessing.Pool(processes,initializer=_init_worker,initargs=(chain_cache,)) as pool:
+      for (point,ci) in pool.imap_unordered(_evaluate,pending,chunksize=1):
+        conn.execute(f"INSERT OR IGNORE INTO results VALUES ({', '.join('?'*(len(PARAMS)+1))})",point+(ci,))
+        conn.commit()
+        print(f"{dict(zip(PARAMS,point))}: {ci}")
+  conn.close()
+  return len(pending)
+
+def main():
+  parser=argparse.ArgumentParser(description="Run a resumable cooperation index parameter sweep")
+  parser.add_argument("spec",help="JSON file mapping each parameter to a list of values")
+  parser.add_argument("--store",default="sweep_results.sqlite",help="SQLite file the results are appended to")
+  parser.add_argument("--processes",type=int,default=None,help="Number of worker processes (default: all cores)")
+  parser.add_argument("--chain-cache",default=None,help="Directory for persisting solved reputation chains")
+  args=parser.parse_args()
+
+  with open(args.spec) as f:
+    spec=json.load(f)
+  computed=run_sweep(spec,args.store,args.processes,args.chain_cache)
+  print(f"Computed {computed} new points, results in {args.store}")
+
+if __name__=="__main__":
+  main()
@@ -0,0 +1,92 @@
+"""Tests of the generosity analysis engine. Run with `python -m pytest` from this directory or the repository root."""
+
+import math
+import warnings
+
+import numpy as np
+import pytest
+
+import benchmark
+import generosity
+
+SOLVER_METHODS=[m for m in generosity.STATIONARY_METHODS if m!="deeptime" or generosity.MarkovStateModel is not None]
+
+@pytest.fixture(autouse=True)
+def fresh_engine():
+  """Every test starts from an empty chain cache and the default solver"""
+  method=generosity.STATIONARY_METHOD
+  generosity.clear_chain_cache()
+  yield
+  generosity.STATIONARY_METHOD=method
+  generosity.clear_chain_cache()
+
+def test_zero_noise_chain_is_reducible():
+  #with no noise and g=0 everyone playing strategy 1 ends with all at reputation 0 or all at reputation r, depending on the start
+  m=generosity.make_sparse_transition_matrix(3,0,1,0,0,0,0,3)
+  assert generosity.closed_class_count(m)==2
+
+@pytest.mark.parametrize("method",SOLVER_METHODS)
+def test_zero_noise_stationary_distribution(method):
+  m=generosity.make_sparse_transition_matrix(3,0,1,0,0,0,0,3)
+  with warnings.catch_warnings():
+    warnings.simplefilter("error")
+    vec=generosity.stationary_distribution(m,method)
+  assert np.all(np.isfinite(vec))
+  assert math.isclose(vec.sum(),1)
+  assert generosity.stationary_residual(m,vec)<=generosity.STATIONARY_TOLERANCE
+  np.testing.assert_allclose(vec,generosity.stationary_distribution(m.toarray(),"power"),atol=1e-8)
+
+@pytest.mark.parametrize("method",SOLVER_METHODS)
+def test_zero_noise_cooperation_index(method):
+  generosity.STATIONARY_METHOD=method
+  with warnings.catch_warnings():
+    warnings.simplefilter("ignore") #power iteration is slow to converge on some of the chains
+    ci=generosity.cooperation_index(3,0,0,0,3,-0.1,1.0,10)
+  assert 0<=ci<=1
+  assert math.isclose(ci,0.37833133119501083,abs_tol=1e-8)
+
+def test_zero_noise_figure_point():
+  #a point of Figure 4a
+  ci=generosity.cooperation_index(6,0.0,0.0,0,5,-0.1,1.0,10)
+  assert 0<=ci<=1
+
+def test_non_finite_solution_is_rejected(monkeypatch):
+  #spsolve returns NaN rather than raising on a singular system, and a NaN residual is never greater than the tolerance
+  m=generosity.make_sparse_transition_matrix(2,1,1,2,0.025,0.025,0.01,3)
+  monkeypatch.setattr(generosity,"sparse_stationary_distribution",lambda m: np.full(m.shape[0],np.nan))
+  vec=generosity.stationary_distribution(m,"splu")
+  assert np.all(np.isfinite(vec))
+  assert generosity.stationary_residual(m,vec)<=generosity.STATIONARY_TOLERANCE
+
+def test_strat_transition_matrix_in_parallel():
+  args=(3,0.025,0.025,0.01,2,-0.1,1.0,10)
+  serial=generosity.strat_transition_matrix(*args)
+  generosity.clear_chain_cache()
+  np.testing.assert_allclose(generosity.strat_transition_matrix(*args,processes=2),serial,atol=1e-12)
+
+#the engine against the reference implementation in benchmark.py, with noise and at the degenerate zero-noise, g=0 point
+NOISE=[(0.025,0.025,0.01),(0.0,0.0,0.0)]
+CHAINS=[(3,0,1,0),(3,0,2,0),(2,1,1,3),(1,2,3,1),(2,2,0,3),(1,3,2,1)] #s1!=s2, as the reference adds both utilities of s1==s2 to one key
+
+@pytest.mark.parametrize("noise",NOISE)
+@pytest.mark.parametrize("chain",CHAINS)
+def test_transition_matrix_matches_reference(chain,noise):
+  (num_s1,num_s2,s1,s2)=chain
+  tm=generosity.make_transition_matrix(num_s1,num_s2,s1,s2,*noise,3)
+  np.testing.assert_allclose(tm,benchmark.reference_transition_matrix(num_s1,num_s2,s1,s2,*noise,3),atol=1e-14)
+
+@pytest.mark.parametrize("noise",NOISE)
+@pytest.mark.parametrize("chain",CHAINS)
+def test_compute_utility_matches_reference(chain,noise):
+  (num_s1,num_s2,s1,s2)=chain
+  u=generosity.compute_utility(num_s1,num_s2,s1,s2,*noise,3,-0.1,1.0)
+  ref=benchmark.reference_compute_utility(num_s1,num_s2,s1,s2,*noise,3,-0.1,1.0)
+  for s in (s1,s2):
+    assert math.isclose(u[s],ref[s],abs_tol=1e-9)
+
+@pytest.mark.parametrize("noise",NOISE)
+@pytest.mark.parametrize("size",[(3,2),(3,3),(4,3)])
+def test_cooperation_index_matches_reference(size,noise):
+  (num_agents,r)=size
+  ci=generosity.cooperation_index(num_agents,*noise,r,-0.1,1.0,10)
+  assert math.isclose(ci,benchmark.reference_cooperation_index(num_agents,*noise,r,-0.1,1.0,10),abs_tol=1e-9)
@@ -1,32 +1,22 @@
-import pandas as pd
-import numpy as np
 import matplotlib.pyplot as plt
-from matplotlib.colors import LinearSegmentedColormap
-from matplotlib.cm import ScalarMappable
 import sys
+import os
 
-def first_row(csv_file):
-    with open(csv_file, 'r') as file:
-        lines = file.read().split('\n')
-        data = [list(filter(None, row.split(';'))) for row in lines if row.strip()]
-        modified_data = [[list(map(float, inner.split(', '))) for inner in outer] for outer in data]
-
-        modified_data = np.array(modified_data)
-
-        averages = np.mean(modified_data, axis=0)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'scripts', 'analysis'))
+from interval_io import load_k_intervals_float64
+from result_cache import load_cached
+from strategies import generations, mean_strategy
 
-        return modified_data[0]
+def first_row(csv_file):
+    return load_cached(csv_file, load_k_intervals_float64)[0]
     
 def plot_line_chart(file_path, save_path):
-    # Load the CSV file into a DataFrame
-    df = pd.DataFrame(data=first_row(file_path))
-
-    # Sum of products of each column
-    sum_of_products = np.sum(df.values * (df.columns.values-5), axis=1)
+    freqs = first_row(file_path)
+    sum_of_products = mean_strategy(freqs)
 
     # Plotting the sum of products as a single line
     plt.figure(figsize=(10, 6))
-    plt.plot(df.index * 100, sum_of_products, label='Average strategy 0-50', color="red")
+    plt.plot(generations(freqs), sum_of_products, label='Average strategy 0-50', color="red")
 
     # Add labels, title, legend, and grid
     plt.xlabel('Generations')
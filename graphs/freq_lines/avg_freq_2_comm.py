@@ -1,41 +1,29 @@
-import pandas as pd
-import numpy as np
 import matplotlib.pyplot as plt
-from matplotlib.colors import LinearSegmentedColormap
-from matplotlib.cm import ScalarMappable
 import sys
+import os
 
-def first_row(csv_file):
-    with open(csv_file, 'r') as file:
-        lines = file.read().split('\n')
-        data = [list(filter(None, row.split(';'))) for row in lines if row.strip()]
-        modified_data = [[list(map(float, inner.split(', '))) for inner in outer] for outer in data]
-
-        modified_data = np.array(modified_data)
-
-        averages = np.mean(modified_data, axis=0)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'scripts', 'analysis'))
+from interval_io import load_k_intervals_float64
+from result_cache import load_cached
+from strategies import generations, mean_strategy
 
-        return modified_data[0]
+def first_row(csv_file):
+    return load_cached(csv_file, load_k_intervals_float64)[0]
     
 def plot_line_chart(file_path, save_path):
-    # Load the CSV file into a DataFrame
-    df = pd.DataFrame(data=first_row(file_path))
-
-    # Sum of products of each column
-    sum_of_products = np.sum(df.values * (df.columns.values-5), axis=1)
+    freqs = first_row(file_path)
+    sum_of_products = mean_strategy(freqs)
 
     # Plotting the sum of products as a single line
     plt.figure(figsize=(10, 6))
-    plt.plot(df.index * 100, sum_of_products, label='Average strategy 0-50', color="red")
-
-    # Load the second CSV file into a DataFrame
-    df2 = pd.DataFrame(data=first_row(file_path[:-8] + "50-100.csv"))
+    plt.plot(generations(freqs), sum_of_products, label='Average strategy 0-50', color="red")
 
-    # Sum of products of each column for the second file
-    sum_of_products2 = np.sum(df2.values * (df2.columns.values-5), axis=1)
+    # Second partition
+    freqs2 = first_row(file_path[:-8] + "50-100.csv")
+    sum_of_products2 = mean_strategy(freqs2)
 
     # Plotting the sum of products for the second file
-    plt.plot(df2.index * 100, sum_of_products2, label='Average strategy 50-100', color="blue")
+    plt.plot(generations(freqs2), sum_of_products2, label='Average strategy 50-100', color="blue")
 
     # Add labels, title, legend, and grid
     plt.xlabel('Generations')
@@ -1,57 +1,34 @@
-import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
 import sys
+import os
 
-def get_data_lists(csv_file):
-    with open(csv_file, 'r') as file:
-        with open(csv_file[:-8] + "50-100.csv", 'r') as file1:
-            lines = file.read().split('\n')
-            data = [list(filter(None, row.split(';'))) for row in lines if row.strip()]
-            modified_data = [[list(map(float, inner.split(', '))) for inner in outer] for outer in data]
-            modified_data = np.array(modified_data)
-
-            lines1 = file1.read().split('\n')
-            data1 = [list(filter(None, row.split(';'))) for row in lines1 if row.strip()]
-            modified_data1 = [[list(map(float, inner.split(', '))) for inner in outer] for outer in data1]
-            modified_data1 = np.array(modified_data1)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'scripts', 'analysis'))
+from interval_io import load_k_intervals_float64
+from result_cache import load_cached
+from strategies import generations, strategy_difference
 
-            return (modified_data, modified_data1)
+def get_data_lists(csv_file):
+    return (load_cached(csv_file, load_k_intervals_float64), load_cached(csv_file[:-8] + "50-100.csv", load_k_intervals_float64))
     
 def plot_line_chart(file_path, additional_file, save_path):
     # Load the CSV files into DataFrames
     d1, d2 = get_data_lists(file_path)
-    diff = []
-    for i in range(len(d1)):
-        df1 = pd.DataFrame(data=d1[i])
-        df2 = pd.DataFrame(data=d2[i])
-        # Sum of products of each column
-        sum_of_products1 = np.sum(df1.values * (df1.columns.values-5), axis=1)
-        sum_of_products2 = np.sum(df2.values * (df2.columns.values-5), axis=1)
-        diff.append([abs(x - y) for x, y in zip(sum_of_products1, sum_of_products2)])
-    
-    averages = np.mean(diff, axis=0)
+    # Difference between the partitions' mean strategies, averaged over the runs
+    averages = np.mean(strategy_difference(d1, d2), axis=0)
 
     print(np.mean(averages,axis=0), np.std(averages, axis=0))
     # Plotting the sum of products as a single line
     plt.figure(figsize=(10, 6))
-    plt.plot(df1.index * 100, averages, label='p=0', color="red")
+    plt.plot(generations(d1), averages, label='p=0', color="red")
 
     d1, d2 = get_data_lists(additional_file)
-    diff = []
-    for i in range(len(d1)):
-        df1 = pd.DataFrame(data=d1[i])
-        df2 = pd.DataFrame(data=d2[i])
-        # Sum of products of each column
-        sum_of_products1 = np.sum(df1.values * (df1.columns.values-5), axis=1)
-        sum_of_products2 = np.sum(df2.values * (df2.columns.values-5), axis=1)
-        diff.append([abs(x - y) for x, y in zip(sum_of_products1, sum_of_products2)])
-    
-    averages = np.mean(diff, axis=0)
+    # Difference between the partitions' mean strategies, averaged over the runs
+    averages = np.mean(strategy_difference(d1, d2), axis=0)
 
     print(np.mean(averages,axis=0), np.std(averages, axis=0))
 
-    plt.plot(df1.index * 100, averages, label='p=0.01', color="blue")
+    plt.plot(generations(d1), averages, label='p=0.01', color="blue")
 
     # Add labels, title, legend, and grid
     plt.xlabel('Generations')
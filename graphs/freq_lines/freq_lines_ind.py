@@ -4,18 +4,14 @@ import matplotlib.pyplot as plt
 from matplotlib.colors import LinearSegmentedColormap
 from matplotlib.cm import ScalarMappable
 import sys
+import os
 
-def first_row(csv_file):
-    with open(csv_file, 'r') as file:
-        lines = file.read().split('\n')
-        data = [list(filter(None, row.split(';'))) for row in lines if row.strip()]
-        modified_data = [[list(map(float, inner.split(', '))) for inner in outer] for outer in data]
-
-        modified_data = np.array(modified_data)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'scripts', 'analysis'))
+from interval_io import load_k_intervals
+from result_cache import load_cached
 
-        averages = np.mean(modified_data, axis=0)
-        
-        return modified_data[0]
+def first_row(csv_file):
+    return load_cached(csv_file, load_k_intervals)[0]
     
 def plot_line_chart(file_path, save_path):
     # Load the CSV file into a DataFrame
@@ -1,15 +1,13 @@
-import csv
 import matplotlib.pyplot as plt
 import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'scripts', 'analysis'))
+from result_cache import load_cached
 
 def create_histogram(csv_file_path, save_path):
     # Read the CSV file
-    data = []
-
-    with open(csv_file_path, 'r') as csv_file:
-        csv_reader = csv.reader(csv_file)
-        for row in csv_reader:
-            data.append(float(row[0]))
+    data = load_cached(csv_file_path)[:, 0]
 
     # Create a histogram plot
     plt.hist(data, bins=[i/100 for i in range(101)], edgecolor='black')  # Bins in 0.01 intervals
@@ -1,6 +1,9 @@
-import pandas as pd
 import matplotlib.pyplot as plt
 import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', '..', '..', 'scripts', 'analysis'))
+from interval_io import IntervalFile
 
 def main():
     # Example CSV files (replace with your files)
@@ -19,11 +22,9 @@ def main():
     all_titles = []
 
     for i, csv_file in enumerate(csv_files):
-        df = pd.read_csv(csv_file, header=None)
-
-        # Extract y values from the DataFrame
-        y_values = df.iloc[y_column].str.split(';')[0][:100]
-        y_values = [float(value) for value in y_values]
+        # Parse only the first 100 intervals of run y_column
+        with IntervalFile(csv_file) as intervals:
+            y_values = intervals.window(y_column, 0, 100)
 
         # Create x values using row numbers as x values
         x_values = [i for i in range(1, 101, 1)]
@@ -1,14 +1,15 @@
-import pandas as pd
 import matplotlib.pyplot as plt
+import os
+import sys
 
-def plot_line_chart_from_csv(csv_file, y_column, title="Line Chart", x_label="X-axis", y_label="Y-axis", output_file="graphs/images/csv_line_chart.png"):
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'scripts', 'analysis'))
+from interval_io import IntervalFile
 
-    # Extract x and y values from the DataFrame
-    df = pd.read_csv(csv_file, header=None)
+def plot_line_chart_from_csv(csv_file, y_column, title="Line Chart", x_label="X-axis", y_label="Y-axis", output_file="graphs/images/csv_line_chart.png"):
 
-    # Extract y values from the DataFrame
-    y_values = df.iloc[y_column].str.split(';')[0][:-1] # takes first data from the 100 runs
-    y_values = [float(value) for value in y_values]  # Convert y values to float
+    # Parse only run y_column of the file
+    with IntervalFile(csv_file) as intervals:
+        y_values = intervals.run(y_column)
 
     # Create x values using row numbers as x values
     x_values = [i for i in range(100, 100001, 100)]
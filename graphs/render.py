@@ -0,0 +1,148 @@
+"""Renders a manifest of figure jobs headlessly, in parallel, skipping jobs whose inputs have not changed.
+
+Each job runs one of the graphs/ scripts as if from the command line (from the repository root), in its own worker
+process with the Agg backend. plt.show() closes the figures instead of opening a window, so scripts that end with it
+do not block, and every figure is closed when the job ends. A job is skipped when its script, its inputs (listed
+files or glob patterns, plus any arguments naming existing files) and its outputs are unchanged since it last rendered.
+
+Manifest (JSON): {"jobs": [{"name": "...", "script": "graphs/...py", "args": [...], "inputs": [...], "outputs": [...]}]}
+
+Usage: `python3 graphs/render.py` (renders graphs/figures.json), `python3 graphs/render.py --force freq_lines`
+"""
+
+import argparse
+import glob
+import json
+import os
+import runpy
+import sys
+import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+DEFAULT_MANIFEST = os.path.join("graphs", "figures.json")
+DEFAULT_STAMPS = os.path.join("graphs", ".render_stamps.json")
+
+def load_manifest(path):
+    with open(path, 'r') as file:
+        jobs = json.load(file)["jobs"]
+    names = [job["name"] for job in jobs]
+    duplicates = sorted({name for name in names if names.count(name) > 1})
+    if duplicates:
+        raise ValueError(f"duplicate job names in {path}: {', '.join(duplicates)}")
+    return jobs
+
+def job_inputs(job):
+    """The script, every file matching the job's input patterns and every argument naming an existing file"""
+    paths = {job["script"]}
+    for pattern in job.get("inputs", []):
+        matches = glob.glob(pattern, recursive=True)
+        if not matches:
+            raise FileNotFoundError(f"no files match input {pattern}")
+        paths.update(matches)
+    paths.update(arg for arg in job.get("args", []) if os.path.isfile(arg))
+    return sorted(paths)
+
+def input_stamp(job):
+    """(mtime, size) of every input of job, which changes whenever one of them is edited, added or removed"""
+    stamp = {}
+    for path in job_inputs(job):
+        stat = os.stat(path)
+        stamp[path] = [stat.st_mtime_ns, stat.st_size]
+    return stamp
+
+def is_up_to_date(job, stamps):
+    return stamps.get(job["name"]) == input_stamp(job) and all(os.path.exists(output) for output in job.get("outputs", []))
+
+def run_job(job):
+    """Runs one job's script as __main__ with the Agg backend. Returns (name, error message or None)."""
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+    plt.show = lambda *args, **kwargs: plt.close('all')
+
+    argv = sys.argv
+    sys.argv = [job["script"]] + [str(arg) for arg in job.get("args", [])]
+    try:
+        runpy.run_path(job["script"], run_name="__main__")
+        missing = [output for output in job.get("outputs", []) if not os.path.exists(output)]
+        return (job["name"], f"did not write {', '.join(missing)}" if missing else None)
+    except SystemExit as e:
+        return (job["name"], None if e.code in (None, 0) else f"exited with {e.code}")
+    except Exception:
+        return (job["name"], traceback.format_exc())
+    finally:
+        plt.close('all')
+        sys.argv = argv
+
+def render(manifest=DEFAULT_MANIFEST, stamps_file=DEFAULT_STAMPS, names=None, processes=None, force=False):
+    """Renders the manifest's jobs (or those named) that are out of date on a pool of processes.
+    A job whose inputs cannot be found fails without stopping the others. Returns (rendered, skipped, failed) job names."""
+    jobs = load_manifest(manifest)
+    if names:
+        unknown = set(names) - {job["name"] for job in jobs}
+        if unknown:
+            raise ValueError(f"unknown jobs: {', '.join(sorted(unknown))}")
+        jobs = [job for job in jobs if job["name"] in names]
+    stamps = {}
+    if os.path.exists(stamps_file):
+        with open(stamps_file, 'r') as file:
+            stamps = json.load(file)
+
+    rendered, skipped, failed = [], [], []
+    pending = {}
+    for job in jobs:
+        try:
+            up_to_date = not force and is_up_to_date(job, stamps)
+        except FileNotFoundError as e:  # an input pattern matches nothing, or an input went away while stamping
+            failed.append(job["name"])
+            stamps.pop(job["name"], None)
+            print(f"Failed {job['name']}: {e}")
+            continue
+        if up_to_date:
+            skipped.append(job["name"])
+        else:
+            pending[job["name"]] = job
+    if pending:
+        for job in pending.values():
+            for output in job.get("outputs", []):
+                os.makedirs(os.path.dirname(output) or ".", exist_ok=True)
+        # A fresh process per job, since scripts import helper modules of the same name and change sys.path
+        with ProcessPoolExecutor(processes, max_tasks_per_child=1) as pool:
+            futures = [pool.submit(run_job, job) for job in pending.values()]
+            for future in as_completed(futures):
+                name, error = future.result()
+                if error is None:
+                    try:
+                        stamps[name] = input_stamp(pending[name])
+                    except FileNotFoundError as e:
+                        error = str(e)
+                if error is None:
+                    rendered.append(name)
+                    print(f"Rendered {name}")
+                else:
+                    failed.append(name)
+                    stamps.pop(name, None)
+                    print(f"Failed {name}: {error}")
+    if pending or failed:
+        with open(stamps_file, 'w') as file:
+            json.dump(stamps, file, indent=2, sort_keys=True)
+    for name in skipped:
+        print(f"Up to date {name}")
+    return (rendered, skipped, failed)
+
+def main():
+    parser = argparse.ArgumentParser(description='Render the figures of a manifest headlessly, skipping figures whose inputs are unchanged')
+    parser.add_argument('jobs', nargs='*', help='Names of the jobs to render (default: all)')
+    parser.add_argument('--manifest', default=DEFAULT_MANIFEST, help=f'Manifest of figure jobs (default: {DEFAULT_MANIFEST})')
+    parser.add_argument('--stamps', default=DEFAULT_STAMPS, help='File recording the inputs of the last render of each job')
+    parser.add_argument('--processes', type=int, default=None, help='Number of worker processes (default: all cores)')
+    parser.add_argument('--force', action='store_true', help='Render every job even if its inputs are unchanged')
+
+    args = parser.parse_args()
+    rendered, skipped, failed = render(args.manifest, args.stamps, args.jobs, args.processes, args.force)
+    print(f"{len(rendered)} rendered, {len(skipped)} up to date, {len(failed)} failed")
+    if failed:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,179 @@
+"""Plots the global metrics (cooperation rate and rewards) against a network parameter, with SD error bars.
+
+The points of each figure are selected from the result catalog (scripts/analysis/catalog.py) by a parameter query
+instead of lists of averages.json/SDs.json paths, and only the result files of the metrics being plotted are read.
+The figures are rendered in parallel worker processes with the Agg backend. Data paths are relative to the repository
+root, whatever the working directory.
+
+Usage: `python3 graphs/template_scripts/plot_global.py --scope global random_p community_n`
+       `python3 graphs/template_scripts/plot_global.py --scope n200` (all figure sets)
+"""
+
+import argparse
+import json
+import os
+import sys
+from collections import defaultdict
+from multiprocessing import Pool
+
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt
+import numpy as np
+
+ROOT = os.path.normpath(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..'))
+sys.path.insert(0, os.path.join(ROOT, 'scripts', 'analysis'))
+from catalog import DEFAULT_DB, build_catalog, parse_result_name, query
+from result_cache import load_cached
+
+METRICS = {
+    "coop-rate": "Cooperation rate",
+    "reward-averages": "Reward average (C)",
+    "reward-final": "Reward average (F)",
+    "reward-variances": "Reward variance",
+}
+
+# Runs shared by every figure of a scope; None matches the older file names without that field
+SCOPES = {
+    "global": {"n": 100, "mr": 0.001, "intervals": [0, None], "endN": [0, None], "local": [0, None]},
+    "local": {"n": 100, "mr": 0.001, "intervals": [0, None], "local": 1},
+    "n200": {"n": 200, "mr": 0.001, "intervals": [0, None], "endN": [0, None], "local": [0, None]},
+}
+
+# Runs stopped early with -endN before endN was part of the file name
+EXCLUDED_DIRECTORIES = [os.path.join("data", "endN")]
+
+# x: the catalog field plotted on the x axis; filters: the rest of the query; x_values: the points to plot.
+# directories: per scope, the only directories the query may match, where runs of other figures share the parameters.
+# legacy: per scope, x value -> directory for runs whose file names predate the network parameters (e.g. net3).
+# summaries: per scope, x value -> directory holding only the averages.json and SDs.json of runs that are not kept.
+FIGURE_SETS = {
+    "random_p": {
+        "x": "network_p1", "label": "Connection probability", "filters": {"network": "random"},
+        "x_values": [i / 16 for i in range(1, 16)] + [1],
+        "legacy": {"global": {0.0625: "data/random/0.0625/global", 0.125: "data/random/0.125/global",
+                              0.25: "data/random/0.25/global", 0.5: "data/random/0.5/global", 1: "data/original/global"}},
+    },
+    "scale_free_ini": {
+        "x": "network_p1", "label": "Number of initial nodes", "filters": {"network": "scale-free"},
+        "x_values": list(range(2, 21, 2)), "xtick_step": 2,
+        "legacy": {"global": {4: "data/scale_free/4,4(original)/global"}},
+    },
+    "small_world_p": {
+        "x": "network_p2", "label": "Rewiring probability", "filters": {"network": "small-world", "network_p1": 4},
+        "x_values": [i / 10 for i in range(1, 11)],
+        "directories": {"local": ["data/local/small_world/p"]},  # not data/local/not_community/5,4,0.5
+        "legacy": {"global": {0.5: "data/small_world/4,0.5(original)/global"}},
+        "summaries": {"local": {1: "data/local/small_world/p/1"}},
+    },
+    "small_world_nei": {
+        "x": "network_p1", "label": "Neighbour distance", "filters": {"network": "small-world", "network_p2": None},
+        "x_values": list(range(1, 11)),
+        "directories": {"local": ["data/local/small_world/n"]},
+        "summaries": {"local": {1: "data/local/small_world/n/1"}},
+    },
+    "community_n": {
+        "x": "network_p1", "label": "Number of communities", "filters": {"network": "community", "network_p2": None},
+        "x_values": list(range(2, 11)),
+        "legacy": {"global": {4: "data/community/4(original)/global"}},
+    },
+    "community_p": {
+        "x": "network_p2", "label": "External link probability", "filters": {"network": "community", "network_p1": 4},
+        "x_values": [i / 10 for i in range(1, 11)],
+    },
+}
+
+def _in_directories(directory, directories):
+    return any(directory == d or directory.startswith(d + os.sep) for d in directories)
+
+def select_files(figure_set, scope, metric, db=DEFAULT_DB):
+    """Returns {x value: [result files]} for one metric of a figure set, covering the whole population"""
+    spec = FIGURE_SETS[figure_set]
+    filters = dict(SCOPES[scope], **spec["filters"], metric=metric)
+    filters[spec["x"]] = spec["x_values"]
+    directories = spec.get("directories", {}).get(scope)
+    files = defaultdict(list)
+    for row in query(db, **filters):
+        if directories is not None and not _in_directories(row["directory"], directories):
+            continue
+        if row["part_start"] == 0 and row["part_end"] == row["n"] and not _in_directories(row["directory"], EXCLUDED_DIRECTORIES):
+            files[row[spec["x"]]].append(os.path.join(ROOT, row["path"]))
+    for x, directory in spec.get("legacy", {}).get(scope, {}).items():
+        directory = os.path.join(ROOT, directory)
+        if os.path.isdir(directory):
+            for filename in sorted(os.listdir(directory)):
+                record = parse_result_name(filename)
+                if record is not None and record["metric"] == metric and record["part_start"] == 0 and record["part_end"] == record["n"]:
+                    files[x].append(os.path.join(directory, filename))
+    return files
+
+def select_summaries(figure_set, scope, metric):
+    """Returns {x value: (mean, SD)} for the points of a figure set whose runs only survive as averages.json and SDs.json"""
+    stats = {}
+    for x, directory in FIGURE_SETS[figure_set].get("summaries", {}).get(scope, {}).items():
+        directory = os.path.join(ROOT, directory)
+        if os.path.isfile(os.path.join(directory, "averages.json")) and os.path.isfile(os.path.join(directory, "SDs.json")):
+            with open(os.path.join(directory, "averages.json")) as f:
+                averages = json.load(f)
+            with open(os.path.join(directory, "SDs.json")) as f:
+                sds = json.load(f)
+            if metric in averages:
+                stats[x] = (averages[metric][0], sds.get(metric, [0])[0])
+    return stats
+
+def point_stats(csv_files):
+    """Mean and population SD over the runs of csv_files, which repeat the same configuration"""
+    runs = np.concatenate([load_cached(csv_file)[:, 0] for csv_file in csv_files])
+    return runs.mean(), runs.std()
+
+def render(task):
+    """Draws one metric of one figure set and returns the path of the saved image, or None if no runs match"""
+    figure_set, scope, metric, db, output_dir = task
+    spec = FIGURE_SETS[figure_set]
+    files = select_files(figure_set, scope, metric, db)
+    summaries = select_summaries(figure_set, scope, metric)
+    if not files and not summaries:
+        return None
+    x_values = sorted(set(files) | set(summaries))
+    stats = [point_stats(files[x]) if x in files else summaries[x] for x in x_values]
+
+    fig, ax = plt.subplots()
+    ax.errorbar(x_values, [mean for mean, _ in stats], yerr=[sd for _, sd in stats], marker='o', linestyle='none',
+                color="grey", markerfacecolor="blue", markeredgecolor="blue")
+    ax.set_xlabel(spec["label"])
+    ax.set_ylabel(METRICS[metric])
+    if "xtick_step" in spec:
+        ax.set_xticks(np.arange(min(x_values), max(x_values) + 1, spec["xtick_step"]))
+
+    save_filepath = os.path.join(output_dir, f"{scope}_{figure_set}_{metric}_error_bars_plot.png")
+    fig.savefig(save_filepath)
+    plt.close(fig)
+    return save_filepath
+
+def main():
+    parser = argparse.ArgumentParser(description='Plot global metrics against network parameters from the result catalog')
+    parser.add_argument('figure_sets', nargs='*', default=list(FIGURE_SETS), help=f'Figure sets to draw (default: all of {", ".join(FIGURE_SETS)})')
+    parser.add_argument('--scope', choices=list(SCOPES), default='global', help='Which runs to plot')
+    parser.add_argument('--metrics', nargs='*', default=list(METRICS), help='Metrics to plot (default: all)')
+    parser.add_argument('--data', default=os.path.join(ROOT, 'data'), help='Data folder, rescanned into the catalog before plotting')
+    parser.add_argument('--db', default=os.path.join(ROOT, DEFAULT_DB), help=f'Catalog database (default: {DEFAULT_DB} in the repository)')
+    parser.add_argument('--output', default=os.path.join(ROOT, 'graphs', 'images'), help='Folder to save the figures to')
+    parser.add_argument('--processes', type=int, default=None, help='Number of worker processes (default: all cores)')
+
+    args = parser.parse_args()
+    args.db, args.output = os.path.abspath(args.db), os.path.abspath(args.output)
+    # the catalog records paths as given, so the data folder is scanned from the repository root as catalog.py build data is
+    data = os.path.abspath(args.data)
+    os.chdir(ROOT)
+    build_catalog(os.path.relpath(data), args.db)
+    os.makedirs(args.output, exist_ok=True)
+    tasks = [(figure_set, args.scope, metric, args.db, args.output) for figure_set in args.figure_sets for metric in args.metrics]
+    with Pool(args.processes) as pool:
+        for (figure_set, _, metric, _, _), save_filepath in zip(tasks, pool.imap(render, tasks)):
+            if save_filepath is None:
+                print(f"No {args.scope} runs for {figure_set} {metric}")
+            else:
+                print(f"Plot saved to {save_filepath}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+import argparse
+import json
+import os
+import re
+from collections import defaultdict
+from multiprocessing import Pool
+
+import numpy as np
+
+from running_stats import RunningStats, iter_chunks
+
+# Simulation output files are named n<size>_..._<metric><start>-<end>.csv, e.g. n100_..._coop-rate0-100.csv
+RESULT_FILE = re.compile(r"^n(\d+)_.*_([A-Za-z-]+?)(?:(\d+)-(\d+))?\.csv$")
+DEFAULT_QUANTILES = [0.05, 0.25, 0.5, 0.75, 0.95]
+
+def result_key(filename):
+    """Returns the key used for a result file in averages.json/SDs.json: the metric name (e.g. coop-rate),
+    followed by the partition (e.g. coop-rate0-50) when the file only covers part of the population."""
+    match = RESULT_FILE.match(filename)
+    n, metric, start, end = match.groups()
+    if start is None or (int(start) == 0 and int(end) == int(n)):
+        return metric
+    return metric + start + "-" + end
+
+def find_result_files(root):
+    """Walks root once and returns {directory: [result csv files]}"""
+    files = defaultdict(list)
+    for directory, _, filenames in os.walk(root):
+        for filename in sorted(filenames):
+            if RESULT_FILE.match(filename):
+                files[directory].append(os.path.join(directory, filename))
+    return files
+
+def column_stats(csv_file, quantiles=DEFAULT_QUANTILES):
+    """Reads a result file (one row per run) once and returns the per-column statistics,
+    or None for files written with -intervals, which hold one ;-separated row of intervals per run.
+    The rows are only kept in memory when quantiles are requested."""
+    with open(csv_file, 'r') as file:
+        if ';' in file.readline():
+            return None
+    stats = RunningStats()
+    chunks = []
+    for chunk in iter_chunks(csv_file):
+        stats.update(chunk)
+        if quantiles:
+            chunks.append(chunk)
+    if stats.count == 0:
+        raise ValueError("no runs in file")
+    result = {
+        "runs": stats.count,
+        "mean": stats.mean.tolist(),
+        "sd": stats.pstdev.tolist(),  # population SD, as statistics.pstdev in sd.py
+        "min": stats.min.tolist(),
+        "max": stats.max.tolist(),
+    }
+    if quantiles:
+        data = np.concatenate(chunks)
+        result["quantiles"] = {str(q): np.quantile(data, q, axis=0).tolist() for q in quantiles}
+    return result
+
+def _file_stats(args):
+    csv_file, quantiles = args
+    try:
+        return csv_file, column_stats(csv_file, quantiles)
+    except ValueError as e:
+        print(f"Skipping {csv_file}: {e}")
+        return csv_file, None
+
+def write_json(data, output_file):
+    with open(output_file, 'w') as jsonfile:
+        json.dump(data, jsonfile, indent=2)
+
+def aggregate(root, processes=None, quantiles=DEFAULT_QUANTILES):
+    """Computes the statistics of every result file under root on a pool of worker processes and writes
+    averages.json, SDs.json and stats.json (all statistics) to each directory containing result files"""
+    files = find_result_files(root)
+    tasks = [(csv_file, quantiles) for directory in files for csv_file in files[directory]]
+    with Pool(processes) as pool:
+        stats = dict(pool.imap_unordered(_file_stats, tasks, chunksize=8))
+
+    for directory, csv_files in sorted(files.items()):
+        directory_stats = {}
+        for csv_file in csv_files:
+            if stats[csv_file] is None:
+                continue
+            key = result_key(os.path.basename(csv_file))
+            if key in directory_stats:
+                print(f"Warning: more than one {key} file in {directory}, using file names as keys")
+                key = os.path.basename(csv_file)
+            directory_stats[key] = stats[csv_file]
+        if not directory_stats:
+            continue
+        write_json({key: s["mean"] for key, s in directory_stats.items()}, os.path.join(directory, "averages.json"))
+        write_json({key: s["sd"] for key, s in directory_stats.items()}, os.path.join(directory, "SDs.json"))
+        write_json(directory_stats, os.path.join(directory, "stats.json"))
+        print(f"Aggregated {len(directory_stats)} files in {directory}")
+
+def main():
+    parser = argparse.ArgumentParser(description='Calculate column averages, standard deviations and quantiles for all result files in a folder')
+    parser.add_argument('folder', help='Path to the data folder, e.g. data/community')
+    parser.add_argument('--processes', type=int, default=None, help='Number of worker processes (default: all cores)')
+    parser.add_argument('--quantiles', type=float, nargs='*', default=DEFAULT_QUANTILES, help='Quantiles to compute, none to keep memory constant')
+
+    args = parser.parse_args()
+    aggregate(args.folder, args.processes, args.quantiles)
+
+if __name__ == "__main__":
+    main()
@@ -2,17 +2,13 @@ import csv
 import argparse
 import os
 
-def average_columns(csv_file):
-    with open(csv_file, 'r') as file:
-        reader = csv.reader(file)
-
-        data = list(reader)
-
-        columns = zip(*data)
+from running_stats import stream_stats
 
-        averages = [sum(map(float, col)) / len(col) for col in columns]
-
-        return averages
+def average_columns(csv_file):
+    stats = stream_stats(csv_file)
+    if stats.count == 0:  # an empty file has no columns
+        return []
+    return stats.mean.tolist()
 
 def write_averages_to_file(averages, csv_file, output_file):
     with open(output_file, 'a', newline='') as file:
@@ -0,0 +1,168 @@
+"""Indexes the simulation result files under a data folder by the parameters encoded in their file names.
+
+Simulation names each output file after its configuration, e.g.
+n100_m300_q1.0_mr0.001_ea0.000_ep0.000_nsFalse_genFalse_faFalse_frFalse_g100000_net[3.0, 10.0]_intervals0_endNFalse_coop-rate0-100.csv,
+so the folder is scanned once and every file name is parsed into typed columns of an SQLite table. Rescans only touch
+files that were added, changed or removed.
+
+Usage: `python3 scripts/analysis/catalog.py build data`
+       `python3 scripts/analysis/catalog.py query network=community mr=0.001 metric=coop-rate`
+"""
+
+import argparse
+import json
+import os
+import re
+import sqlite3
+
+DEFAULT_DB = os.path.join("data", "catalog.sqlite")
+
+NETWORKS = {0: "fully-connected", 1: "bipartite", 2: "random", 3: "community", 4: "scale-free", 5: "small-world"}
+
+# Older files have no -intervals/-local field, or endN in place of local, and the network as a bare type (net3)
+RESULT_NAME = re.compile(
+    r"^n(?P<n>\d+)_m(?P<m>\d+)_q(?P<q>[\d.]+)_mr(?P<mr>[\d.]+)_ea(?P<ea>[\d.]+)_ep(?P<ep>[\d.]+)"
+    r"_ns(?P<ns>True|False)_gen(?P<generosity>True|False)(?:_g1(?P<g1>[\d.]+)_g2(?P<g2>[\d.]+))?"
+    r"_fa(?P<fa>True|False)_fr(?P<fr>True|False)_g(?P<generations>\d+)_net(?P<net>\[[^\]]*\]|\d+)"
+    r"(?:_intervals(?P<intervals>\d+))?(?:_endN(?P<endN>True|False))?(?:_local(?P<local>True|False))?"
+    r"_(?P<metric>[A-Za-z-]+?)(?:(?P<part_start>\d+)-(?P<part_end>\d+))?\.csv$")
+
+# (column, SQL type) in table order; path and directory are as found when scanning, e.g. data/community/10/...
+COLUMNS = [
+    ("path", "TEXT PRIMARY KEY"), ("directory", "TEXT"), ("mtime", "REAL"), ("size", "INTEGER"),
+    ("n", "INTEGER"), ("m", "INTEGER"), ("q", "REAL"), ("mr", "REAL"), ("ea", "REAL"), ("ep", "REAL"),
+    ("ns", "INTEGER"), ("generosity", "INTEGER"), ("g1", "REAL"), ("g2", "REAL"), ("fa", "INTEGER"), ("fr", "INTEGER"),
+    ("generations", "INTEGER"), ("network_type", "INTEGER"), ("network", "TEXT"), ("network_p1", "REAL"), ("network_p2", "REAL"),
+    ("network_params", "TEXT"), ("intervals", "INTEGER"), ("endN", "INTEGER"), ("local", "INTEGER"),
+    ("metric", "TEXT"), ("part_start", "INTEGER"), ("part_end", "INTEGER"),
+]
+_CASTS = {"INTEGER": int, "REAL": float, "TEXT": str}
+
+def parse_result_name(filename):
+    """Returns the configuration encoded in a result file name as a dict of typed fields, or None if it is not a result file.
+    A file covering the whole population gets part_start=0 and part_end=n."""
+    match = RESULT_NAME.match(filename)
+    if match is None:
+        return None
+    fields = match.groupdict()
+    record = {}
+    for key in ("n", "m", "generations", "intervals", "part_start", "part_end"):
+        record[key] = None if fields[key] is None else int(fields[key])
+    for key in ("q", "mr", "ea", "ep", "g1", "g2"):
+        record[key] = None if fields[key] is None else float(fields[key])
+    for key in ("ns", "generosity", "fa", "fr", "endN", "local"):
+        record[key] = None if fields[key] is None else int(fields[key] == "True")
+
+    net = fields["net"]
+    values = json.loads(net) if net.startswith("[") else [float(net)]
+    record["network_type"] = int(values[0])
+    record["network"] = NETWORKS.get(record["network_type"])
+    record["network_p1"] = values[1] if len(values) > 1 else None
+    record["network_p2"] = values[2] if len(values) > 2 else None
+    record["network_params"] = json.dumps(values[1:])
+
+    record["metric"] = fields["metric"]
+    if record["part_start"] is None:
+        record["part_start"], record["part_end"] = 0, record["n"]
+    return record
+
+def open_catalog(db=DEFAULT_DB):
+    """Opens (creating if needed) the catalog database"""
+    conn = sqlite3.connect(db)
+    conn.row_factory = sqlite3.Row
+    columns = ", ".join(f"{name} {kind}" for name, kind in COLUMNS)
+    conn.execute(f"CREATE TABLE IF NOT EXISTS files ({columns})")
+    for index in ("metric", "network_type", "mr", "directory"):
+        conn.execute(f"CREATE INDEX IF NOT EXISTS files_{index} ON files ({index})")
+    conn.commit()
+    return conn
+
+def build_catalog(root, db=DEFAULT_DB):
+    """Walks root once and brings the catalog up to date: new or changed result files are (re)parsed, and files under
+    root that no longer exist are dropped. Returns (files added or updated, files removed)."""
+    root = os.path.normpath(root)
+    conn = open_catalog(db)
+    known = {row["path"]: (row["mtime"], row["size"]) for row in conn.execute("SELECT path, mtime, size FROM files")
+             if row["path"].startswith(root + os.sep)}
+    seen = set()
+    updated = []
+    for directory, _, filenames in os.walk(root):
+        for filename in filenames:
+            record = parse_result_name(filename)
+            if record is None:
+                continue
+            path = os.path.join(directory, filename)
+            stat = os.stat(path)
+            seen.add(path)
+            if known.get(path) == (stat.st_mtime, stat.st_size):
+                continue
+            record.update(path=path, directory=directory, mtime=stat.st_mtime, size=stat.st_size)
+            updated.append(tuple(record[name] for name, _ in COLUMNS))
+
+    removed = [(path,) for path in known if path not in seen]
+    conn.executemany(f"INSERT OR REPLACE INTO files VALUES ({', '.join('?' * len(COLUMNS))})", updated)
+    conn.executemany("DELETE FROM files WHERE path = ?", removed)
+    conn.commit()
+    conn.close()
+    return len(updated), len(removed)
+
+def query(db=DEFAULT_DB, **filters):
+    """Returns the catalog rows (as dicts) matching every filter, e.g. query(network="community", mr=0.001, metric="coop-rate").
+    A filter value may be a list, matching any of its values, or None, matching files without that field (older file
+    names have no intervals, endN or local field), and a list may include None."""
+    kinds = dict(COLUMNS)
+    clauses, params = [], []
+    for name, value in filters.items():
+        if name not in kinds:
+            raise ValueError(f"unknown catalog field {name}")
+        if value is None:
+            clauses.append(f"{name} IS NULL")
+        elif isinstance(value, (list, tuple, set)):
+            values = [v for v in value if v is not None]
+            clause = f"{name} IN ({', '.join('?' * len(values))})"
+            clauses.append(f"({clause} OR {name} IS NULL)" if len(values) < len(value) else clause)
+            params.extend(values)
+        else:
+            clauses.append(f"{name} = ?")
+            params.append(value)
+    where = " WHERE " + " AND ".join(clauses) if clauses else ""
+    conn = open_catalog(db)
+    rows = [dict(row) for row in conn.execute(f"SELECT * FROM files{where} ORDER BY path", params)]
+    conn.close()
+    return rows
+
+def parse_filters(terms):
+    """Parses command line terms like mr=0.001 or metric=coop-rate,reward-final into query filters, cast to the column types"""
+    kinds = dict(COLUMNS)
+    filters = {}
+    for term in terms:
+        name, _, value = term.partition("=")
+        if name not in kinds:
+            raise ValueError(f"unknown catalog field {name}")
+        cast = _CASTS[kinds[name].split()[0]]
+        if cast is int and value in ("True", "False"):
+            values = [int(value == "True")]
+        else:
+            values = [cast(v) for v in value.split(",")]
+        filters[name] = values if len(values) > 1 else values[0]
+    return filters
+
+def main():
+    parser = argparse.ArgumentParser(description='Index simulation result files by the parameters in their names')
+    parser.add_argument('--db', default=DEFAULT_DB, help=f'Catalog database (default: {DEFAULT_DB})')
+    commands = parser.add_subparsers(dest='command', required=True)
+    build = commands.add_parser('build', help='Scan a data folder and update the catalog')
+    build.add_argument('folder', nargs='?', default='data', help='Path to the data folder')
+    find = commands.add_parser('query', help='Print the paths of the files matching field=value filters')
+    find.add_argument('filters', nargs='*', help='e.g. network=community mr=0.001 metric=coop-rate')
+
+    args = parser.parse_args()
+    if args.command == 'build':
+        updated, removed = build_catalog(args.folder, args.db)
+        print(f"Catalog {args.db}: {updated} files added or updated, {removed} removed")
+    else:
+        for row in query(args.db, **parse_filters(args.filters)):
+            print(row["path"])
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+import mmap
+
+import numpy as np
+
+# Strategies k = -5..6 of the kAvFreq/kFinFreq files, one relative frequency each
+K_STRATEGIES = 12
+
+# ';' separates intervals and ', ' the values within an interval, so mapping both to spaces
+# leaves a row that np.fromstring can tokenize in one call
+_SEPARATORS = str.maketrans(';,', '  ')
+
+def _parse_row(line, dtype):
+    return np.fromstring(line.translate(_SEPARATORS), dtype=dtype, sep=' ')
+
+def load_intervals(csv_file, values_per_interval=1, dtype=np.float32):
+    """Loads a result file written with -intervals, with one row of ;-separated intervals per run, into a
+    preallocated (runs, intervals) array, or (runs, intervals, values_per_interval) when each interval holds
+    several ', '-separated values"""
+    with open(csv_file, 'r') as file:
+        lines = [line for line in file.read().split('\n') if line.strip()]
+    if not lines:
+        raise ValueError(f"{csv_file} is empty")
+
+    first = _parse_row(lines[0], dtype)
+    if len(first) % values_per_interval != 0:
+        raise ValueError(f"{csv_file}: first row has {len(first)} values, not a multiple of {values_per_interval}")
+    intervals = len(first) // values_per_interval
+    shape = (len(lines), intervals) if values_per_interval == 1 else (len(lines), intervals, values_per_interval)
+    data = np.empty(shape, dtype=dtype)
+
+    flat = data.reshape(len(lines), -1)
+    flat[0] = first
+    for run, line in enumerate(lines[1:], start=1):
+        row = _parse_row(line, dtype)
+        if len(row) != flat.shape[1]:
+            raise ValueError(f"{csv_file}: run {run} has {len(row)} values, expected {flat.shape[1]}")
+        flat[run] = row
+    return data
+
+def load_k_intervals(csv_file, dtype=np.float32):
+    """Loads a kAvFreq/kFinFreq file written with -intervals into a (runs, intervals, 12) array, where
+    data[run, interval, k + 5] is the relative frequency of strategy k"""
+    return load_intervals(csv_file, K_STRATEGIES, dtype)
+
+def load_k_intervals_float64(csv_file):
+    """load_k_intervals in double precision, the precision of the Python floats the results were first computed with.
+    A loader of its own, so result_cache keeps its copies apart from the float32 ones."""
+    return load_k_intervals(csv_file, np.float64)
+
+class IntervalFile:
+    """Random access to the runs of a file written with -intervals without parsing the whole file.
+
+    The byte offset of every line is indexed once when the file is opened (memory-mapped), after which a single run,
+    a range of runs or a window of intervals within a run is parsed on its own:
+
+        with IntervalFile(csv_file) as intervals:
+            first_run = intervals.run(0)
+            window = intervals.window(3, 100, 200)  # intervals 100-199 of run 3
+    """
+
+    def __init__(self, csv_file, values_per_interval=1, dtype=np.float32):
+        self.csv_file = csv_file
+        self.values_per_interval = values_per_interval
+        self.dtype = dtype
+        self._file = open(csv_file, 'rb')
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:  # empty file
+            self._map = b""
+        newlines = np.flatnonzero(np.frombuffer(self._map, dtype=np.uint8) == ord('\n'))
+        starts = np.concatenate(([0], newlines + 1))
+        ends = np.concatenate((newlines, [len(self._map)]))
+        nonblank = ends - starts > 0
+        self._starts = starts[nonblank]
+        self._ends = ends[nonblank]
+
+    def __len__(self):
+        return len(self._starts)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        if isinstance(self._map, mmap.mmap):
+            self._map.close()
+        self._file.close()
+
+    def _line(self, run):
+        if not -len(self) <= run < len(self):
+            raise IndexError(f"{self.csv_file} has {len(self)} runs, no run {run}")
+        return self._map[self._starts[run]:self._ends[run]]
+
+    def _shape(self, values):
+        if self.values_per_interval == 1:
+            return values
+        return values.reshape(-1, self.values_per_interval)
+
+    def run(self, run):
+        """The intervals of one run, as (intervals,) or (intervals, values_per_interval)"""
+        return self._shape(_parse_row(self._line(run).decode(), self.dtype))
+
+    def runs(self, start=0, stop=None):
+        """Runs start to stop (exclusive) stacked into one array"""
+        return np.stack([self.run(run) for run in range(*slice(start, stop).indices(len(self)))])
+
+    def window(self, run, start, stop):
+        """Intervals start to stop (exclusive) of one run, parsing only those intervals"""
+        line = self._line(run).rstrip(b'\r')
+        ends = np.flatnonzero(np.frombuffer(line, dtype=np.uint8) == ord(';'))
+        if not line.endswith(b';'):  # the last interval has no trailing ';'
+            ends = np.append(ends, len(line))
+        start, stop, _ = slice(start, stop).indices(len(ends))
+        if start >= stop:
+            return self._shape(np.empty(0, dtype=self.dtype))
+        begin = ends[start - 1] + 1 if start > 0 else 0
+        return self._shape(_parse_row(line[begin:ends[stop - 1]].decode(), self.dtype))
@@ -1,19 +1,14 @@
 import csv
 import argparse
 import os
+import sys
 import numpy as np
 
-def average_columns(csv_file):
-    with open(csv_file, 'r') as file:
-        lines = file.read().split('\n')
-        data = [list(filter(None, row.split(';'))) for row in lines if row.strip()]
-        modified_data = [[list(map(float, inner.split(', '))) for inner in outer] for outer in data]
-
-        modified_data = np.array(modified_data)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from interval_io import load_k_intervals
 
-        averages = np.mean(modified_data, axis=0)
-        
-        return averages
+def average_columns(csv_file):
+    return np.mean(load_k_intervals(csv_file, np.float64), axis=0)
 
 def write_averages_to_file(averages, csv_file, output_file):
     with open(output_file, 'a', newline='') as file:
@@ -1,19 +1,14 @@
 import csv
 import argparse
 import os
+import sys
 import numpy as np
 
-def calculate_std_dev(csv_file):
-    with open(csv_file, 'r') as file:
-        lines = file.read().split('\n')
-        data = [list(filter(None, row.split(';'))) for row in lines if row.strip()]
-        modified_data = [[list(map(float, inner.split(', '))) for inner in outer] for outer in data]
-
-        modified_data = np.array(modified_data)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from interval_io import load_k_intervals
 
-        std_dev = np.std(modified_data, axis=0)
-        
-        return std_dev
+def calculate_std_dev(csv_file):
+    return np.std(load_k_intervals(csv_file, np.float64), axis=0)
 
 def write_std_dev_to_file(std_dev, csv_file, output_file):
     with open(output_file, 'a', newline='') as file:
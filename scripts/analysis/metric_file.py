@@ -0,0 +1,70 @@
+"""Reads the binary metrics files written by `Simulation -binary`.
+
+A metrics file holds every run of one configuration and partition. It starts with one line of text describing the
+records, padded with spaces to a multiple of 64 bytes:
+
+    DGMETRIC version=1 dtype=<f4 records=1000 interval=100 generations=100000 metrics=coop-rate,...,kFinFreq[6]
+
+followed by one fixed-width record of float32 values (one per metric) per interval per run. The file is memory-mapped
+rather than parsed, so opening it takes milliseconds whatever its size:
+
+    metrics = MetricFile("data/..._metrics0-100.bin")
+    metrics.data                   # (runs, records, metrics)
+    metrics["coop-rate"]           # (runs, records)
+    metrics["kAvFreq"]             # (runs, records, 12), the same layout as interval_io.load_k_intervals
+
+Records of a run stopped early by -endN are NaN.
+"""
+
+import numpy as np
+
+MAGIC = "DGMETRIC"
+
+def read_header(path):
+    """Returns the fields of the header of a metrics file as a dict, with metrics as a list and the header length in bytes"""
+    with open(path, 'rb') as file:
+        line = file.readline()
+    fields = line.decode('ascii').split()
+    if not fields or fields[0] != MAGIC:
+        raise ValueError(f"{path} is not a metrics file")
+    header = dict(field.split('=', 1) for field in fields[1:])
+    header["version"] = int(header["version"])
+    header["records"] = int(header["records"])
+    header["interval"] = int(header["interval"])
+    header["generations"] = int(header["generations"])
+    header["metrics"] = header["metrics"].split(',')
+    header["size"] = len(line)
+    return header
+
+class MetricFile:
+    """The runs of a metrics file as a read-only (runs, records, metrics) memory-mapped array.
+
+    Only complete runs are mapped, so a file that is still being appended to can be read at any time."""
+
+    def __init__(self, path):
+        self.path = path
+        self.header = read_header(path)
+        self.metrics = self.header["metrics"]
+        dtype = np.dtype(self.header["dtype"])
+        run_size = self.header["records"] * len(self.metrics) * dtype.itemsize
+        with open(path, 'rb') as file:
+            file.seek(0, 2)
+            runs = (file.tell() - self.header["size"]) // run_size
+        shape = (runs, self.header["records"], len(self.metrics))
+        if runs == 0:
+            self.data = np.empty(shape, dtype=dtype)
+        else:
+            self.data = np.memmap(path, dtype=dtype, mode='r', offset=self.header["size"], shape=shape)
+
+    def __len__(self):
+        return self.data.shape[0]
+
+    def __getitem__(self, metric):
+        """One metric as (runs, records), or every k of kAvFreq/kFinFreq as (runs, records, 12)"""
+        if metric in self.metrics:
+            return self.data[..., self.metrics.index(metric)]
+        columns = [i for i, name in enumerate(self.metrics) if name.startswith(metric + "[")]
+        if not columns:
+            raise KeyError(f"{self.path} has no metric {metric}")
+        return self.data[..., columns[0]:columns[-1] + 1]
+
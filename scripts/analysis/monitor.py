@@ -0,0 +1,197 @@
+"""Follows the result files of running simulations and keeps their per-column statistics up to date.
+
+Every few seconds only the rows appended since the last poll are read and folded into a RunningStats per file, and
+averages.json, SDs.json and stats.json (runs, averages, SDs, minima, maxima and confidence interval half-widths) are
+rewritten in each directory whose files grew, in the same format as aggregate.py. With --ci-width the monitor exits
+once the confidence interval of the chosen metric is that tight in every file being followed, so a sweep can be
+stopped early.
+
+Usage: `python3 scripts/analysis/monitor.py data/community --ci-width 0.01 --metric coop-rate`
+"""
+
+import argparse
+import json
+import os
+import statistics
+import time
+
+import numpy as np
+
+from aggregate import RESULT_FILE, result_key
+from running_stats import RunningStats
+
+class ResultTail:
+    """The statistics of one result file, updated from the complete rows appended to it since the last poll"""
+
+    def __init__(self, csv_file):
+        self.csv_file = csv_file
+        self.reset()
+
+    def reset(self):
+        self.offset = 0
+        self.partial = b""
+        self.intervals = None
+        self.stats = RunningStats()
+        self.skipped = 0
+
+    def parse(self, rows):
+        """Returns rows as a (runs, columns) array and the number of malformed rows left out of it, i.e. rows that are not
+        numbers or do not have as many columns as the rows before them"""
+        try:
+            values = np.loadtxt(rows, delimiter=',', ndmin=2)
+            if self.stats.count == 0 or values.shape[1] == len(self.stats.mean):
+                return values, 0
+        except ValueError:
+            pass
+        parsed = []
+        for row in rows:
+            try:
+                parsed.append(np.loadtxt([row], delimiter=',', ndmin=1))
+            except ValueError:
+                continue
+        if self.stats.count:
+            columns = len(self.stats.mean)
+        else:
+            columns = statistics.mode(len(values) for values in parsed) if parsed else 0
+        parsed = [values for values in parsed if len(values) == columns]
+        return np.array(parsed).reshape(len(parsed), columns), len(rows) - len(parsed)
+
+    def poll(self):
+        """Reads the rows appended since the last poll and returns how many there were. A file that shrank is re-read.
+        Malformed rows are left out, with their number in skipped."""
+        size = os.path.getsize(self.csv_file)
+        if size < self.offset:
+            self.reset()
+        self.skipped = 0
+        if size == self.offset:
+            return 0
+        with open(self.csv_file, 'rb') as file:
+            file.seek(self.offset)
+            data = file.read(size - self.offset)
+        lines = (self.partial + data).split(b'\n')
+        partial = lines.pop()  # a row still being written
+        rows = [line.decode(errors='replace') for line in lines if line.strip()]
+        intervals = self.intervals if self.intervals is not None or not rows else ';' in rows[0]
+        values, skipped = (None, 0) if intervals or not rows else self.parse(rows)
+        # the rows are only consumed once they have been parsed
+        self.offset += len(data)
+        self.partial = partial
+        self.intervals = intervals
+        if values is None:  # no complete row, or one row of intervals per run, which averages.json does not cover
+            return 0
+        self.skipped = skipped
+        self.stats.update(values)
+        return len(values)
+
+    def ci_half_width(self, confidence=0.95):
+        """Half-width of the normal confidence interval of each column's mean, or None before there are two runs"""
+        if self.stats.count < 2:
+            return None
+        z = statistics.NormalDist().inv_cdf(0.5 + confidence / 2)
+        return z * np.sqrt(self.stats.variance / self.stats.count)
+
+def write_json(data, output_file):
+    """Writes via a temporary file so that readers never see a partly written file"""
+    tmp = output_file + ".tmp"
+    with open(tmp, 'w') as jsonfile:
+        json.dump(data, jsonfile, indent=2)
+    os.replace(tmp, output_file)
+
+class Monitor:
+    """Follows every result file under root, including files created after it started"""
+
+    def __init__(self, root, confidence=0.95):
+        self.root = root
+        self.confidence = confidence
+        self.tails = {}
+
+    def scan(self):
+        for directory, _, filenames in os.walk(self.root):
+            for filename in sorted(filenames):
+                csv_file = os.path.join(directory, filename)
+                if RESULT_FILE.match(filename) and csv_file not in self.tails:
+                    self.tails[csv_file] = ResultTail(csv_file)
+
+    def poll(self):
+        """Reads new rows from every file and rewrites the summaries of the directories that changed.
+        Returns the number of new runs seen."""
+        self.scan()
+        changed = set()
+        new_runs = 0
+        for csv_file, tail in self.tails.items():
+            try:
+                rows = tail.poll()
+            except FileNotFoundError:
+                continue
+            if tail.skipped:
+                print(f"Skipped {tail.skipped} malformed rows of {csv_file}")
+            if rows:
+                changed.add(os.path.dirname(csv_file))
+                new_runs += rows
+        for directory in sorted(changed):
+            self.write_summaries(directory)
+        return new_runs
+
+    def directory_tails(self, directory):
+        tails = {}
+        for csv_file, tail in sorted(self.tails.items()):
+            if os.path.dirname(csv_file) == directory and tail.stats.count > 0:
+                key = result_key(os.path.basename(csv_file))
+                tails[key if key not in tails else os.path.basename(csv_file)] = tail
+        return tails
+
+    def write_summaries(self, directory):
+        tails = self.directory_tails(directory)
+        stats = {}
+        for key, tail in tails.items():
+            ci = tail.ci_half_width(self.confidence)
+            stats[key] = {
+                "runs": tail.stats.count,
+                "mean": tail.stats.mean.tolist(),
+                "sd": tail.stats.pstdev.tolist(),  # population SD, as in sd.py and aggregate.py
+                "min": tail.stats.min.tolist(),
+                "max": tail.stats.max.tolist(),
+                "ci_half_width": None if ci is None else ci.tolist(),
+            }
+        write_json({key: s["mean"] for key, s in stats.items()}, os.path.join(directory, "averages.json"))
+        write_json({key: s["sd"] for key, s in stats.items()}, os.path.join(directory, "SDs.json"))
+        write_json(stats, os.path.join(directory, "stats.json"))
+
+    def converged(self, metric, ci_width, min_runs=2):
+        """True once every followed file of metric has at least min_runs runs and a confidence interval half-width of at most ci_width"""
+        tails = [tail for csv_file, tail in self.tails.items()
+                 if RESULT_FILE.match(os.path.basename(csv_file)).group(2) == metric and not tail.intervals]
+        if not tails:
+            return False
+        for tail in tails:
+            ci = tail.ci_half_width(self.confidence)
+            if tail.stats.count < min_runs or ci is None or np.max(ci) > ci_width:
+                return False
+        return True
+
+def main():
+    parser = argparse.ArgumentParser(description='Keep averages.json, SDs.json and stats.json up to date while simulations append results')
+    parser.add_argument('folder', help='Path to the data folder being written to, e.g. data/community')
+    parser.add_argument('--poll', type=float, default=10, help='Seconds between polls')
+    parser.add_argument('--confidence', type=float, default=0.95, help='Confidence level of the reported intervals')
+    parser.add_argument('--ci-width', type=float, default=None, help='Exit once the confidence interval half-width of --metric is at most this in every file')
+    parser.add_argument('--metric', default='coop-rate', help='Metric checked against --ci-width')
+    parser.add_argument('--min-runs', type=int, default=10, help='Runs needed in every file before stopping on --ci-width')
+    parser.add_argument('--once', action='store_true', help='Poll once and exit')
+
+    args = parser.parse_args()
+    monitor = Monitor(args.folder, args.confidence)
+    while True:
+        new_runs = monitor.poll()
+        if new_runs:
+            runs = sum(tail.stats.count for tail in monitor.tails.values())
+            print(f"{time.strftime('%H:%M:%S')} {new_runs} new runs, {runs} in {len(monitor.tails)} files")
+        if args.ci_width is not None and monitor.converged(args.metric, args.ci_width, args.min_runs):
+            print(f"All {args.metric} confidence intervals are within {args.ci_width}")
+            break
+        if args.once:
+            break
+        time.sleep(args.poll)
+
+if __name__ == "__main__":
+    main()
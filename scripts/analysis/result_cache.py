@@ -0,0 +1,64 @@
+import hashlib
+import os
+
+import numpy as np
+
+from interval_io import load_intervals, load_k_intervals
+
+# Binary copies of the parsed result files, shared by every script (override with RESULT_CACHE_DIR)
+DEFAULT_CACHE_DIR = os.environ.get("RESULT_CACHE_DIR",
+                                   os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', '.result_cache'))
+
+def load_result(csv_file):
+    """Parses a result file into an array: (runs, columns) for files written without -intervals, (runs, intervals)
+    for other files written with -intervals and (runs, intervals, 12) for kAvFreq/kFinFreq files with -intervals"""
+    with open(csv_file, 'r') as file:
+        intervals = ';' in file.readline()
+    if not intervals:
+        return np.loadtxt(csv_file, delimiter=',', ndmin=2)
+    name = os.path.basename(csv_file)
+    if "_kAvFreq" in name or "_kFinFreq" in name:
+        return load_k_intervals(csv_file)
+    return load_intervals(csv_file)
+
+def _cache_prefix(csv_file, loader):
+    key = os.path.abspath(csv_file) + "\0" + loader.__module__ + "." + loader.__name__
+    return hashlib.sha1(key.encode()).hexdigest()
+
+def cache_file(csv_file, loader=load_result, cache_dir=DEFAULT_CACHE_DIR):
+    """Path of the cached copy of csv_file, which changes whenever the file's mtime or size does"""
+    stat = os.stat(csv_file)
+    return os.path.join(cache_dir, f"{_cache_prefix(csv_file, loader)}_{stat.st_mtime_ns}_{stat.st_size}.npy")
+
+def load_cached(csv_file, loader=load_result, cache_dir=DEFAULT_CACHE_DIR):
+    """Returns loader(csv_file), parsing the text file only the first time and then memory-mapping a .npy copy
+    kept in cache_dir. The copy is keyed by path, mtime and size, so appending runs to the file invalidates it."""
+    path = cache_file(csv_file, loader, cache_dir)
+    if os.path.exists(path):
+        return np.load(path, mmap_mode='r')
+
+    data = loader(csv_file)
+    os.makedirs(cache_dir, exist_ok=True)
+    prefix = os.path.basename(path).split('_')[0]
+    for old in os.listdir(cache_dir):
+        if old.startswith(prefix + "_") and old.endswith(".npy") and old != os.path.basename(path):
+            try:
+                os.remove(os.path.join(cache_dir, old))
+            except FileNotFoundError:  # removed by another process
+                pass
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, 'wb') as file:
+        np.save(file, data)
+    os.replace(tmp, path)  # other processes never see a partly written file
+    return np.load(path, mmap_mode='r')
+
+def clear_cache(cache_dir=DEFAULT_CACHE_DIR):
+    """Removes every cached copy, returning how many files were removed"""
+    if not os.path.isdir(cache_dir):
+        return 0
+    removed = 0
+    for name in os.listdir(cache_dir):
+        if name.endswith(".npy"):
+            os.remove(os.path.join(cache_dir, name))
+            removed += 1
+    return removed
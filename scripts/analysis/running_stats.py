@@ -0,0 +1,77 @@
+import itertools
+
+import numpy as np
+
+DEFAULT_CHUNK_ROWS = 10000
+
+class RunningStats:
+    """Per-column count, mean, variance, minimum and maximum, updated a chunk of rows at a time.
+
+    The mean and sum of squared deviations are combined with Welford's online update in its
+    batched form (Chan et al.), so memory stays constant however many runs a file holds."""
+
+    def __init__(self):
+        self.count = 0
+        self.mean = None
+        self.m2 = None
+        self.min = None
+        self.max = None
+
+    def update(self, rows):
+        """Adds a (runs, columns) array, or a single row, to the statistics"""
+        rows = np.atleast_2d(np.asarray(rows, dtype=float))
+        if len(rows) == 0:
+            return
+        chunk = RunningStats()
+        chunk.count = len(rows)
+        chunk.mean = rows.mean(axis=0)
+        chunk.m2 = ((rows - chunk.mean) ** 2).sum(axis=0)
+        chunk.min = rows.min(axis=0)
+        chunk.max = rows.max(axis=0)
+        self.merge(chunk)
+
+    def merge(self, other):
+        """Combines the statistics of another RunningStats (e.g. from a different worker) into this one"""
+        if other.count == 0:
+            return
+        if self.count == 0:
+            self.count, self.mean, self.m2, self.min, self.max = other.count, other.mean.copy(), other.m2.copy(), other.min.copy(), other.max.copy()
+            return
+        count = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean = self.mean + delta * other.count / count
+        self.m2 = self.m2 + other.m2 + delta ** 2 * self.count * other.count / count
+        self.min = np.minimum(self.min, other.min)
+        self.max = np.maximum(self.max, other.max)
+        self.count = count
+
+    @property
+    def pvariance(self):
+        """Population variance, as statistics.pvariance"""
+        return self.m2 / self.count
+
+    @property
+    def pstdev(self):
+        """Population standard deviation, as statistics.pstdev"""
+        return np.sqrt(self.pvariance)
+
+    @property
+    def variance(self):
+        """Sample variance, as statistics.variance"""
+        return self.m2 / (self.count - 1)
+
+def iter_chunks(csv_file, chunk_rows=DEFAULT_CHUNK_ROWS, delimiter=','):
+    """Yields the rows of a numeric csv file as (at most chunk_rows, columns) float arrays"""
+    with open(csv_file, 'r') as file:
+        while True:
+            lines = [line for line in itertools.islice(file, chunk_rows) if line.strip()]
+            if not lines:
+                return
+            yield np.loadtxt(lines, delimiter=delimiter, ndmin=2)
+
+def stream_stats(csv_file, chunk_rows=DEFAULT_CHUNK_ROWS, delimiter=','):
+    """Returns the RunningStats of every column of csv_file, reading it chunk_rows rows at a time"""
+    stats = RunningStats()
+    for chunk in iter_chunks(csv_file, chunk_rows, delimiter):
+        stats.update(chunk)
+    return stats
@@ -1,19 +1,14 @@
 import csv
 import argparse
-import statistics
 import os
 
-def std_dev_columns(csv_file):
-    with open(csv_file, 'r') as file:
-        reader = csv.reader(file)
-
-        data = list(reader)
-
-        columns = zip(*data)
+from running_stats import stream_stats
 
-        std_devs = [statistics.pstdev(map(float, col)) for col in columns]
-
-        return std_devs
+def std_dev_columns(csv_file):
+    stats = stream_stats(csv_file)
+    if stats.count == 0:  # an empty file has no columns
+        return []
+    return stats.pstdev.tolist()
 
 def write_std_to_file(SDs, csv_file, output_file):
     with open(output_file, 'a', newline='') as file:
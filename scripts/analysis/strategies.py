@@ -0,0 +1,23 @@
+import numpy as np
+
+# Strategy k of each column of a kAvFreq/kFinFreq interval
+STRATEGIES = np.arange(-5, 7, dtype=np.float64)
+
+def mean_strategy(freqs):
+    """Frequency-weighted mean strategy sum(f_k * k) of every interval of a (..., 12) array of strategy frequencies,
+    e.g. the (runs, intervals, 12) array of load_k_intervals, which gives a (runs, intervals) array"""
+    return np.asarray(freqs) @ STRATEGIES
+
+def strategy_variance(freqs):
+    """Frequency-weighted variance sum(f_k * (k - mean)^2) of the strategies of every interval of a (..., 12) array"""
+    freqs = np.asarray(freqs)
+    deviations = STRATEGIES - mean_strategy(freqs)[..., np.newaxis]
+    return np.sum(freqs * deviations ** 2, axis=-1)
+
+def strategy_difference(freqs1, freqs2):
+    """Absolute difference between the mean strategies of two partitions, interval by interval and run by run"""
+    return np.abs(mean_strategy(freqs1) - mean_strategy(freqs2))
+
+def generations(freqs, interval_length=100):
+    """The generation at the start of each interval of a (..., intervals, 12) array, as on the x axis of the freq_lines plots"""
+    return np.arange(np.shape(freqs)[-2]) * interval_length
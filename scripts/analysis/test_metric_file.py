@@ -0,0 +1,66 @@
+"""Round trip of a binary metrics file through MetricFile. The file is written byte for byte as Simulation -binary
+writes it: binaryHeader(), then per run recordsPerRun() little-endian float32 records, NaN after an -endN stop."""
+
+import numpy as np
+import pytest
+
+from metric_file import MetricFile, read_header
+
+METRICS = (["coop-rate", "reward-averages", "reward-final", "reward-variances"]
+           + [f"kAvFreq[{k}]" for k in range(-5, 7)] + [f"kFinFreq[{k}]" for k in range(-5, 7)])
+
+def binary_header(records, interval, generations):
+    """Simulation.binaryHeader()"""
+    line = (f"DGMETRIC version=1 dtype=<f4 records={records} interval={interval} generations={generations} "
+            f"metrics={','.join(METRICS)}")
+    size = (len(line) + 1 + 63) // 64 * 64
+    return (line + " " * (size - len(line) - 1) + "\n").encode("ascii")
+
+def write_metrics(path, runs, interval, generations):
+    """Writes runs, a list of (stopped records, metrics) arrays, as Simulation.run does with -binary"""
+    records = 1 if interval == 0 else (generations + interval - 1) // interval
+    with open(path, "wb") as file:
+        file.write(binary_header(records, interval, generations))
+        for run in runs:
+            values = np.full((records, len(METRICS)), np.nan, dtype="<f4")
+            values[:len(run)] = run
+            file.write(values.tobytes())
+
+@pytest.fixture
+def runs():
+    rng = np.random.default_rng(0)
+    return [rng.random((10, len(METRICS))).astype("<f4"), rng.random((4, len(METRICS))).astype("<f4")]  # the second stopped by -endN
+
+def test_header(tmp_path, runs):
+    path = tmp_path / "metrics0-100.bin"
+    write_metrics(path, runs, 100, 1000)
+    header = read_header(path)
+    assert header["size"] % 64 == 0
+    assert (header["version"], header["dtype"], header["records"], header["interval"], header["generations"]) == (1, "<f4", 10, 100, 1000)
+    assert header["metrics"] == METRICS
+
+def test_round_trip(tmp_path, runs):
+    path = tmp_path / "metrics0-100.bin"
+    write_metrics(path, runs, 100, 1000)
+    metrics = MetricFile(path)
+    assert len(metrics) == 2
+    assert metrics.data.shape == (2, 10, len(METRICS))
+    np.testing.assert_array_equal(metrics.data[0], runs[0])
+    np.testing.assert_array_equal(metrics.data[1, :4], runs[1])
+    assert np.isnan(metrics.data[1, 4:]).all()  # the records after the -endN stop
+    np.testing.assert_array_equal(metrics["coop-rate"][0], runs[0][:, 0])
+    assert metrics["kAvFreq"].shape == (2, 10, 12)
+    np.testing.assert_array_equal(metrics["kAvFreq"][0], runs[0][:, 4:16])
+    np.testing.assert_array_equal(metrics["kFinFreq"][1, :4], runs[1][:, 16:28])
+    with pytest.raises(KeyError):
+        metrics["kFreq"]
+
+def test_partial_run_is_not_mapped(tmp_path, runs):
+    path = tmp_path / "metrics0-100.bin"
+    runs = [run[:1] for run in runs]  # one record per run without -intervals
+    write_metrics(path, runs, 0, 1000)
+    with open(path, "ab") as file:
+        file.write(np.zeros(5, dtype="<f4").tobytes())  # a run still being appended
+    metrics = MetricFile(path)
+    assert metrics.data.shape == (2, 1, len(METRICS))
+    np.testing.assert_array_equal(metrics.data[:, 0], [runs[0][0], runs[1][0]])
@@ -0,0 +1,170 @@
+"""Runs the repetitions of a set of Simulation configurations on a pool of worker processes.
+
+A spec lists the configurations as Simulation arguments, either directly or as a grid of options:
+
+    {"reps": 100,
+     "base": "-g 100000 -quiet -n 200 -m 300",
+     "grid": {"-net": ["5 4 0.1", "5 4 0.2", "5 4 0.3"]},
+     "configs": ["-g 100000 -quiet -net 0"]}
+
+With "seed" in the spec, repetition r runs with `-seed <seed> -firstRun r`, so every repetition draws its own
+reproducible stream of random numbers.
+
+Every (configuration, seed, repetition) that finishes is recorded in an SQLite ledger, so rerunning the same spec only
+runs the repetitions that are missing or failed, and changing the seed runs them all again. Failures are recorded in
+the ledger's failures table with the end of the simulation's output. All repetitions of a
+configuration append to the same result files.
+Simulation appends the rows of a finished run while holding a lock on each result file, so the repetitions of one
+configuration can run at the same time, with or without -intervals.
+
+Usage: `python3 scripts/sweep.py scripts/sweeps/small_world_local.json --processes 32`
+"""
+
+import argparse
+import collections
+import itertools
+import json
+import os
+import shlex
+import sqlite3
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+CLASSPATH = ".:./bin:./lib/commons-cli-1.5.0/commons-cli-1.5.0.jar"
+DEFAULT_LEDGER = "sweep_ledger.sqlite"
+ERROR_LINES = 20  # lines of a failed run's output kept as its error; Simulation prints its errors and usage to stdout
+
+def expand_spec(spec):
+    """Returns the sorted list of distinct configurations of spec, each as a normalised argument string"""
+    configs = [shlex.split(config) for config in spec.get("configs", [])]
+    if "grid" in spec:
+        base = shlex.split(spec.get("base", ""))
+        options = list(spec["grid"])
+        for values in itertools.product(*(spec["grid"][option] for option in options)):
+            args = list(base)
+            for option, value in zip(options, values):
+                args.append(option)
+                if value is not True:  # true marks a flag without a value, e.g. "-local": [true]
+                    args.extend(shlex.split(str(value)))
+            configs.append(args)
+    elif "base" in spec and not configs:
+        configs.append(shlex.split(spec["base"]))
+    return sorted({shlex.join(args) for args in configs})
+
+LEDGER_TABLE = ("CREATE TABLE IF NOT EXISTS runs (config TEXT NOT NULL, seed TEXT NOT NULL, rep INTEGER NOT NULL, "
+                "seconds REAL NOT NULL, finished TEXT NOT NULL, PRIMARY KEY (config, seed, rep))")
+
+def ledger_seed(seed):
+    """The seed as recorded in the ledger, '' for runs without -seed"""
+    return "" if seed is None else str(seed)
+
+def open_ledger(path):
+    """Opens (creating if needed) the ledger of finished repetitions. A ledger from before repetitions were keyed by seed
+    is converted, its repetitions recorded as run without -seed."""
+    conn = sqlite3.connect(path)
+    columns = [row[1] for row in conn.execute("PRAGMA table_info(runs)")]
+    if columns and "seed" not in columns:
+        conn.execute("ALTER TABLE runs RENAME TO runs_unseeded")
+        conn.execute(LEDGER_TABLE)
+        conn.execute("INSERT INTO runs SELECT config, '', rep, seconds, finished FROM runs_unseeded")
+        conn.execute("DROP TABLE runs_unseeded")
+    conn.execute(LEDGER_TABLE)
+    conn.execute("CREATE TABLE IF NOT EXISTS failures (config TEXT NOT NULL, seed TEXT NOT NULL, rep INTEGER NOT NULL, "
+                 "error TEXT NOT NULL, finished TEXT NOT NULL)")
+    conn.commit()
+    return conn
+
+def missing_reps(conn, config, reps, seed=None):
+    done = {rep for (rep,) in conn.execute("SELECT rep FROM runs WHERE config = ? AND seed = ?", (config, ledger_seed(seed)))}
+    return [rep for rep in range(reps) if rep not in done]
+
+def check_seed_support(java="java", classpath=CLASSPATH, cwd="."):
+    """Raises RuntimeError, with the end of the usage text Simulation printed, unless the compiled Simulation accepts
+    -seed, rather than letting every repetition fail"""
+    result = subprocess.run([java, "-classpath", classpath, "Simulation", "-help"], cwd=cwd, stdout=subprocess.PIPE,
+                            stderr=subprocess.STDOUT, text=True)
+    if "-seed" not in result.stdout:
+        output = "\n".join(result.stdout.strip().splitlines()[-ERROR_LINES:])
+        raise RuntimeError(f"the spec has a seed but the compiled Simulation does not accept -seed: recompile it (see README.md). "
+                           f"Simulation -help exited with code {result.returncode} and printed:\n{output}")
+
+def run_simulation(config, rep, java="java", classpath=CLASSPATH, cwd=".", seed=None):
+    """Runs one repetition and returns (config, rep, seconds, error or None)"""
+    args = shlex.split(config)
+    if seed is not None:
+        args += ["-seed", str(seed), "-firstRun", str(rep)]
+    start = time.perf_counter()
+    with subprocess.Popen([java, "-classpath", classpath, "Simulation"] + args, cwd=cwd, stdout=subprocess.PIPE,
+                          stderr=subprocess.STDOUT, text=True) as process:
+        output = collections.deque(process.stdout, maxlen=ERROR_LINES)  # only the end of the output is kept
+    error = None if process.returncode == 0 else f"exit code {process.returncode}: {''.join(output).strip()}"
+    return (config, rep, time.perf_counter() - start, error)
+
+def available_cores():
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:  # not available on macOS
+        return os.cpu_count() or 1
+
+def run_sweep(spec, ledger=DEFAULT_LEDGER, processes=None, java="java", classpath=CLASSPATH, cwd="."):
+    """Runs every repetition of spec missing from the ledger on processes workers (default: one per available core).
+    Returns (repetitions run, repetitions failed)."""
+    reps = int(spec.get("reps", 1))
+    seed = spec.get("seed")
+    if seed is not None:
+        check_seed_support(java, classpath, cwd)
+    conn = open_ledger(ledger)
+    pending = [(config, missing_reps(conn, config, reps, seed)) for config in expand_spec(spec)]
+    pending = [(config, missing) for config, missing in pending if missing]
+    total = sum(len(missing) for _, missing in pending)
+    print(f"{total} repetitions to run over {len(pending)} configurations")
+
+    ran = failed = 0
+    with ThreadPoolExecutor(processes or available_cores()) as pool:  # each thread waits on one java process
+        futures = [pool.submit(run_simulation, config, rep, java, classpath, cwd, seed) for config, missing in pending for rep in missing]
+        for future in as_completed(futures):
+            config, rep, seconds, error = future.result()
+            if error is None:
+                conn.execute("INSERT OR REPLACE INTO runs VALUES (?, ?, ?, ?, ?)",
+                             (config, ledger_seed(seed), rep, seconds, time.strftime("%Y-%m-%dT%H:%M:%S")))
+                conn.commit()
+                ran += 1
+                print(f"[{ran}/{total}] {config} rep {rep}: {seconds:.1f}s")
+            else:
+                conn.execute("INSERT INTO failures VALUES (?, ?, ?, ?, ?)",
+                             (config, ledger_seed(seed), rep, error, time.strftime("%Y-%m-%dT%H:%M:%S")))
+                conn.commit()
+                failed += 1
+                print(f"Failed {config} rep {rep}: {error}")
+    conn.close()
+    return (ran, failed)
+
+def main():
+    parser = argparse.ArgumentParser(description='Run the repetitions of a Simulation sweep in parallel, skipping repetitions already done')
+    parser.add_argument('spec', help='JSON file with reps and configs and/or base + grid')
+    parser.add_argument('--ledger', default=DEFAULT_LEDGER, help=f'SQLite file recording finished repetitions (default: {DEFAULT_LEDGER})')
+    parser.add_argument('--processes', type=int, default=None, help='Simulations to run at once (default: available cores)')
+    parser.add_argument('--java', default='java', help='Java executable')
+    parser.add_argument('--classpath', default=CLASSPATH, help='Classpath of the compiled simulation')
+    parser.add_argument('--dry-run', action='store_true', help='List the missing repetitions without running them')
+
+    args = parser.parse_args()
+    with open(args.spec) as f:
+        spec = json.load(f)
+    if args.dry_run:
+        conn = open_ledger(args.ledger)
+        for config in expand_spec(spec):
+            missing = missing_reps(conn, config, int(spec.get("reps", 1)), spec.get("seed"))
+            print(f"{len(missing)} missing: {config}")
+        conn.close()
+        return
+    try:
+        ran, failed = run_sweep(spec, args.ledger, args.processes, args.java, args.classpath)
+    except RuntimeError as e:
+        sys.exit(f"Error: {e}")
+    print(f"{ran} repetitions run, {failed} failed, ledger in {args.ledger}")
+
+if __name__ == "__main__":
+    main()
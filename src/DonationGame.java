@@ -5,7 +5,6 @@ import java.util.Arrays;
 import java.util.HashMap;
 import java.util.HashSet;
 import java.util.Map;
-import java.util.Random;
 import java.util.Set;
 import java.text.DecimalFormat;
 
@@ -49,10 +48,10 @@ public class DonationGame {
     protected final static double b = 1; // benefit from receiving a donation
     protected final static double c = 0.1; // cost of donation
 
-    protected static RandomGenerator rand = RandomGenerator.of("Xoroshiro128PlusPlus");
+    protected RandomGenerator rand; // all random numbers of the game, including its network, come from this generator
     protected static final DecimalFormat df = new DecimalFormat("0.00");
     
-    private static Set<Integer> preferentialAttachment(Map<Integer, Set<Integer>> adjacencyList, int newNode, Random random) {
+    private static Set<Integer> preferentialAttachment(Map<Integer, Set<Integer>> adjacencyList, int newNode, RandomGenerator random) {
         Set<Integer> existingNodes = adjacencyList.keySet();
         double totalDegree = 0;
 
@@ -95,7 +94,12 @@ public class DonationGame {
         return total/2;
     }
 
-    public DonationGame(int n, int m, double q, double mr, boolean preventNegativePayoffs, double[] network, int[][] outPartShape) {        
+    public DonationGame(int n, int m, double q, double mr, boolean preventNegativePayoffs, double[] network, int[][] outPartShape) {
+        this(n, m, q, mr, preventNegativePayoffs, network, outPartShape, RandomGenerator.of("Xoroshiro128PlusPlus"));
+    }
+
+    public DonationGame(int n, int m, double q, double mr, boolean preventNegativePayoffs, double[] network, int[][] outPartShape, RandomGenerator rand) {        
+        this.rand = rand;
         this.n = n;
         this.m = m;
         this.q = q;
@@ -143,14 +147,13 @@ public class DonationGame {
             if (network.length >= 2){
                 randomP = network[1];
             }
-            Random random = new Random();
             for (int i = 0; i < n; i++) {
                 for (int j = 0; j < n; j++) {
                     if (i == j){
                         this.adjMat[i][j] = false;
                         this.adjMat[j][i] = false;
                     }else{
-                        boolean isConnected = random.nextFloat() < randomP; // adjust probability of connection
+                        boolean isConnected = rand.nextFloat() < randomP; // adjust probability of connection
                         this.adjMat[i][j] = isConnected;
                         this.adjMat[j][i] = isConnected;
                     }
@@ -163,8 +166,7 @@ public class DonationGame {
             if (network.length == 3){
                 communityP = network[2];
             }
-            Random random = new Random();
-    
+
             // connect nodes within communities
             int nodesPerCommunity = n / numCommunities;
             for (int community = 0; community < numCommunities; community++) {
@@ -180,7 +182,7 @@ public class DonationGame {
             for (int i = 0; i < n; i++) {
                 for (int j = i + 1; j < n; j++) {
                     if (!this.adjMat[i][j]) { // only connect if not already connected within the community
-                        boolean isConnected = random.nextFloat() < communityP;
+                        boolean isConnected = rand.nextFloat() < communityP;
                         if (isConnected) {
                             this.adjMat[i][j] = true;
                             this.adjMat[j][i] = true;
@@ -192,7 +194,6 @@ public class DonationGame {
             if (network.length >= 2){
                 initialNodes = (int) network[1];
             }
-            Random random = new Random();
             Map<Integer, Set<Integer>> adjList = new HashMap<>();
 
             // initialize the network with a small number of nodes
@@ -210,7 +211,7 @@ public class DonationGame {
     
             // grow the network using the Barabási–Albert model
             for (int i = initialNodes; i < n; i++) {
-                Set<Integer> newConnections = preferentialAttachment(adjList, i, random);
+                Set<Integer> newConnections = preferentialAttachment(adjList, i, rand);
                 adjList.put(i, newConnections);
 
                 // update existing nodes with new connections
@@ -248,13 +249,12 @@ public class DonationGame {
             }
 
             // rewire edges with a certain probability
-            Random random = new Random();
             for (int i = 0; i < n; i++) {
                 for (int neighbor = 0; neighbor < n; neighbor++) {
-                    if (this.adjMat[i][neighbor] && random.nextDouble() < rewiringP) {
+                    if (this.adjMat[i][neighbor] && rand.nextDouble() < rewiringP) {
                         int newNeighbor;
                         do {
-                            newNeighbor = random.nextInt(n);
+                            newNeighbor = rand.nextInt(n);
                         } while (newNeighbor == i || this.adjMat[i][newNeighbor]);
 
                         this.adjMat[i][neighbor] = false;
@@ -455,7 +455,7 @@ public class DonationGame {
         }
     }
 
-    public static int weightedRandomChoice(double[] rewardsScaled, double totalReward) {
+    public int weightedRandomChoice(double[] rewardsScaled, double totalReward) {
         int selected = 0;
         double total = rewardsScaled[0];
         for (int i = 1; i < rewardsScaled.length; i++) {
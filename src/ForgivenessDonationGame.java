@@ -1,4 +1,5 @@
 import java.util.Arrays;
+import java.util.random.RandomGenerator;
 import java.util.stream.DoubleStream;
 
 // Implementation of action and assessment forgiveness as presented by
@@ -13,8 +14,8 @@ public class ForgivenessDonationGame extends NoisyDonationGame {
     static double[] forgivenessStrategySpace = {0.001, 0.5, 1.0, 1.355, 1.67};
 
     public ForgivenessDonationGame(int n, int m, double q, double mr, boolean preventNegativePayoffs, 
-        double er, double ea, boolean fa, boolean fr, double[] network, int[][] outPartShape) {
-            super(n, m, q, mr, preventNegativePayoffs, er, ea, network, outPartShape);
+        double er, double ea, boolean fa, boolean fr, double[] network, int[][] outPartShape, RandomGenerator rand) {
+            super(n, m, q, mr, preventNegativePayoffs, er, ea, network, outPartShape, rand);
             this.fa = fa;
             this.fr = fr;
             this.forgivenessStrategies = new double[n];
@@ -34,12 +35,12 @@ public class ForgivenessDonationGame extends NoisyDonationGame {
                     // check whether interaction observed
                     if (rand.nextDouble() < q) {
                         // if misperceived as defection
-                        if (ep > 0.0 && DonationGame.rand.nextDouble() < ep) {
+                        if (ep > 0.0 && rand.nextDouble() < ep) {
                             // check whether potential for reputation (assessment) forgiveness 
                             if (fr) {
                                 double imageScore = super.getImageScore(i, donor);
                                 // if not forgiving reduce image score
-                                if (DonationGame.rand.nextDouble() >= 
+                                if (rand.nextDouble() >= 
                                     Math.exp(-((-imageScore + 5) / forgivenessStrategies[i]))) {
                                         super.decrementImage(i, donor);
                                 }
@@ -64,12 +65,12 @@ public class ForgivenessDonationGame extends NoisyDonationGame {
                     super.incrementImage(i, donor);
                 } else {
                     // if misperceived as defection
-                    if (ep > 0.0 && DonationGame.rand.nextDouble() < ep) {
+                    if (ep > 0.0 && rand.nextDouble() < ep) {
                         // check whether potential for reputation (assessment) forgiveness 
                         if (fr) {
                             double imageScore = super.getImageScore(i, donor);
                             // if not forgiving reduce image score
-                            if (DonationGame.rand.nextDouble() >= 
+                            if (rand.nextDouble() >= 
                                 Math.exp(-((-imageScore + 5) / forgivenessStrategies[i]))) {
                                     super.decrementImage(i, donor);
                             }
@@ -101,14 +102,14 @@ public class ForgivenessDonationGame extends NoisyDonationGame {
                     // check whether interaction observed
                     if (rand.nextDouble() < q) {
                         // if misperceived as cooperation
-                        if (ep > 0.0 && DonationGame.rand.nextDouble() < ep) {
+                        if (ep > 0.0 && rand.nextDouble() < ep) {
                             super.incrementImage(i, donor);
                         } else {
                             // check whether potential for reputation (assessment) forgiveness 
                             if (fr) {
                                 double imageScore = super.getImageScore(i, donor);
                                 // if not forgiving reduce image score
-                                if (DonationGame.rand.nextDouble() >= 
+                                if (rand.nextDouble() >= 
                                     Math.exp(-((-imageScore + 5) / forgivenessStrategies[i]))) {
                                         super.decrementImage(i, donor);
                                 }
@@ -132,14 +133,14 @@ public class ForgivenessDonationGame extends NoisyDonationGame {
                     super.decrementImage(i, donor);
                 } else {
                     // if misperceived as cooperation
-                    if (ep > 0.0 && DonationGame.rand.nextDouble() < ep) {
+                    if (ep > 0.0 && rand.nextDouble() < ep) {
                         super.incrementImage(i, donor);
                     } else {
                         // check whether potential for reputation (assessment) forgiveness 
                         if (fr) {
                             double imageScore = super.getImageScore(i, donor);
                             // if not forgiving reduce image score
-                            if (DonationGame.rand.nextDouble() >= 
+                            if (rand.nextDouble() >= 
                                 Math.exp(-((-imageScore + 5) / forgivenessStrategies[i]))) {
                                     super.decrementImage(i, donor);
                             }
@@ -156,10 +157,10 @@ public class ForgivenessDonationGame extends NoisyDonationGame {
             
     public void tick() {
         for (int i = 0; i < m; i++) {
-            int donor = DonationGame.rand.nextInt(n);
-            int recipient = DonationGame.rand.nextInt(n);
+            int donor = rand.nextInt(n);
+            int recipient = rand.nextInt(n);
             while (recipient == donor) {
-                recipient = DonationGame.rand.nextInt(n);
+                recipient = rand.nextInt(n);
             }
             double imageScore = super.getImageScore(donor, recipient);
             boolean intendToDonate;
@@ -170,11 +171,11 @@ public class ForgivenessDonationGame extends NoisyDonationGame {
                 intendToDonate = false;
             }
             // impose action noise
-            if (intendToDonate && ea > 0.0 && DonationGame.rand.nextDouble() < ea) {
+            if (intendToDonate && ea > 0.0 && rand.nextDouble() < ea) {
                 intendToDonate = false;
             }
             // potential to donate through action forgiveness
-            if (!intendToDonate && (fa) && DonationGame.rand.nextDouble() < 
+            if (!intendToDonate && (fa) && rand.nextDouble() < 
                 Math.exp(-((-imageScore + 5) / forgivenessStrategies[donor]))) {
                     intendToDonate = true;
                     forgiving = true;
@@ -1,3 +1,5 @@
+import java.util.random.RandomGenerator;
+
 // Implementation of generosity in the donation game as described by 
 // L. Schmid, P. Shati, C. Hilbe, and K. Chatterjee, ‘The evolution of indirect reciprocity under
 // action and assessment generosity’, Scientific Reports, 11(17443), (2021)
@@ -8,8 +10,8 @@ public class GenerosityDonationGame extends NoisyDonationGame {
     double g2;
 
     public GenerosityDonationGame(int n, int m, double q, double mr, boolean preventNegativePayoffs, 
-        double ea, double ep, double g1, double g2, double[] network, int[][] outPartShape) {
-            super(n, m, q, mr, preventNegativePayoffs, ea, ep, network, outPartShape);
+        double ea, double ep, double g1, double g2, double[] network, int[][] outPartShape, RandomGenerator rand) {
+            super(n, m, q, mr, preventNegativePayoffs, ea, ep, network, outPartShape, rand);
             this.g1 = g1;
             this.g2 = g2;
         }       
@@ -24,9 +26,9 @@ public class GenerosityDonationGame extends NoisyDonationGame {
                     // check whether interaction observed
                     if (i != donor && rand.nextDouble() < q) {
                         // if misperceived as defection
-                        if (ep > 0.0 && DonationGame.rand.nextDouble() < ep) {
+                        if (ep > 0.0 && rand.nextDouble() < ep) {
                             // assessment generosity check
-                            if (DonationGame.rand.nextDouble() < g1) {
+                            if (rand.nextDouble() < g1) {
                                 super.incrementImage(i, donor);
                             } else {
                                 super.decrementImage(i, donor);
@@ -47,9 +49,9 @@ public class GenerosityDonationGame extends NoisyDonationGame {
                 } else {
                     if (i != donor) {
                         // if misperceived as defection
-                        if (ep > 0.0 && DonationGame.rand.nextDouble() < ep) {
+                        if (ep > 0.0 && rand.nextDouble() < ep) {
                             // assessment generosity check
-                            if (DonationGame.rand.nextDouble() < g1) {
+                            if (rand.nextDouble() < g1) {
                                 super.incrementImage(i, donor);
                             } else {
                                 super.decrementImage(i, donor);
@@ -74,11 +76,11 @@ public class GenerosityDonationGame extends NoisyDonationGame {
                     // check whether interaction observed
                     if (i != donor && rand.nextDouble() < q) {
                         // if misperceived as cooperation
-                        if (ep > 0.0 && DonationGame.rand.nextDouble() < ep) {
+                        if (ep > 0.0 && rand.nextDouble() < ep) {
                             super.incrementImage(i, donor);
                         } else {
                             // assessment generosity check
-                            if (DonationGame.rand.nextDouble() < g1) {
+                            if (rand.nextDouble() < g1) {
                                 super.incrementImage(i, donor);
                             } else {
                                 super.decrementImage(i, donor);
@@ -97,11 +99,11 @@ public class GenerosityDonationGame extends NoisyDonationGame {
                 } else {
                     if (i != donor) {
                         // if misperceived as cooperation
-                        if (ep > 0.0 && DonationGame.rand.nextDouble() < ep) {
+                        if (ep > 0.0 && rand.nextDouble() < ep) {
                             super.incrementImage(i, donor);
                         } else {
                             // assessment generosity check
-                            if (DonationGame.rand.nextDouble() < g1) {
+                            if (rand.nextDouble() < g1) {
                                 super.incrementImage(i, donor);
                             } else {
                                 super.decrementImage(i, donor);
@@ -117,10 +119,10 @@ public class GenerosityDonationGame extends NoisyDonationGame {
             
     public void tick() {
         for (int i = 0; i < m; i++) {
-            int donor = DonationGame.rand.nextInt(n);
-            int recipient = DonationGame.rand.nextInt(n);
+            int donor = rand.nextInt(n);
+            int recipient = rand.nextInt(n);
             while (recipient == donor) {
-                recipient = DonationGame.rand.nextInt(n);
+                recipient = rand.nextInt(n);
             }
 
             double imageScore = super.getImageScore(donor, recipient);
@@ -132,11 +134,11 @@ public class GenerosityDonationGame extends NoisyDonationGame {
                 intendToDonate = false;
             }
             // impose action noise
-            if (intendToDonate && ea > 0.0 && DonationGame.rand.nextDouble() < ea) {
+            if (intendToDonate && ea > 0.0 && rand.nextDouble() < ea) {
                 intendToDonate = false;
             }
             // generosity check
-            if (!intendToDonate && DonationGame.rand.nextDouble() < g2) {
+            if (!intendToDonate && rand.nextDouble() < g2) {
                 intendToDonate = true;
             }
             if (intendToDonate) {
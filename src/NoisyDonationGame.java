@@ -1,3 +1,5 @@
+import java.util.random.RandomGenerator;
+
 // Extension to the donation game incorporating action and perception noise
 // Perception noise is as described by
 // L. Schmid, P. Shati, C. Hilbe, and K. Chatterjee, ‘The evolution of indirect reciprocity under
@@ -11,8 +13,8 @@ public class NoisyDonationGame extends DonationGame {
     double ep;
 
     public NoisyDonationGame(int n, int m, double q, double mr, boolean preventNegativePayoffs, 
-        double ea, double ep, double[] network, int[][] outPartShape) {        
-            super(n, m, q, mr, preventNegativePayoffs, network, outPartShape);
+        double ea, double ep, double[] network, int[][] outPartShape, RandomGenerator rand) {        
+            super(n, m, q, mr, preventNegativePayoffs, network, outPartShape, rand);
             this.ea = ea;
             this.ep = ep;
         }
@@ -28,7 +30,7 @@ public class NoisyDonationGame extends DonationGame {
                     super.incrementImage(i, donor);
                 } else {
                     if (i != donor && rand.nextDouble() < q) {
-                        if (ep > 0.0 && DonationGame.rand.nextDouble() < ep) {
+                        if (ep > 0.0 && rand.nextDouble() < ep) {
                             super.decrementImage(i, donor);
                         } else {
                             super.incrementImage(i, donor);
@@ -43,7 +45,7 @@ public class NoisyDonationGame extends DonationGame {
                     super.incrementImage(i, donor);
                 } else {
                     if (i != donor) {
-                        if (ep > 0.0 && DonationGame.rand.nextDouble() < ep) {
+                        if (ep > 0.0 && rand.nextDouble() < ep) {
                             super.decrementImage(i, donor);
                         } else {
                             super.incrementImage(i, donor);
@@ -61,7 +63,7 @@ public class NoisyDonationGame extends DonationGame {
                     super.decrementImage(i, donor);
                 } else {
                     if (i != donor && rand.nextDouble() < q) {
-                        if (ep > 0.0 && DonationGame.rand.nextDouble() < ep) {
+                        if (ep > 0.0 && rand.nextDouble() < ep) {
                             super.incrementImage(i, donor);
                         } else {
                             super.decrementImage(i, donor);
@@ -76,7 +78,7 @@ public class NoisyDonationGame extends DonationGame {
                     super.decrementImage(i, donor);
                 } else {
                     if (i != donor) {
-                        if (ep > 0.0 && DonationGame.rand.nextDouble() < ep) {
+                        if (ep > 0.0 && rand.nextDouble() < ep) {
                             super.incrementImage(i, donor);
                         } else {
                             super.decrementImage(i, donor);
@@ -90,10 +92,10 @@ public class NoisyDonationGame extends DonationGame {
     
     public void tick() {
         for (int i = 0; i < m; i++) {
-            int donor = DonationGame.rand.nextInt(n);
-            int recipient = DonationGame.rand.nextInt(n);
+            int donor = rand.nextInt(n);
+            int recipient = rand.nextInt(n);
             while (recipient == donor) {
-                recipient = DonationGame.rand.nextInt(n);
+                recipient = rand.nextInt(n);
             }
 
             double imageScore = getImageScore(donor, recipient);
@@ -105,7 +107,7 @@ public class NoisyDonationGame extends DonationGame {
                 intendToDonate = false;
             }
             // impose action noise
-            if (intendToDonate && ea > 0.0 && DonationGame.rand.nextDouble() < ea) {
+            if (intendToDonate && ea > 0.0 && rand.nextDouble() < ea) {
                 intendToDonate = false;
             }
             if (intendToDonate) {
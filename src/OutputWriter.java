@@ -0,0 +1,101 @@
+import java.io.ByteArrayOutputStream;
+import java.io.Closeable;
+import java.io.IOException;
+import java.nio.ByteBuffer;
+import java.nio.channels.FileChannel;
+import java.nio.channels.FileLock;
+import java.nio.file.Path;
+import java.nio.file.StandardOpenOption;
+import java.util.Arrays;
+import java.util.HashMap;
+import java.util.Map;
+
+// Appends the rows of completed runs to the output files of a simulation. Each file is opened once and kept open
+// until the simulation ends, and its rows are buffered until at least flushBytes are waiting (0 writes the rows of
+// every run as soon as it completes). Each flush appends its rows while holding an exclusive lock on the file, so
+// simulations appending to the same file only ever interleave whole rows. A plain append is not enough: how much of
+// a single write is kept together depends on the OS and file system, and a large flush can be split by another
+// process's rows.
+
+public class OutputWriter implements Closeable {
+    private final int flushBytes;
+    private final Map<Path, FileChannel> files = new HashMap<>();
+    private final Map<Path, ByteArrayOutputStream> buffers = new HashMap<>();
+
+    public OutputWriter(int flushBytes) {
+        this.flushBytes = flushBytes;
+    }
+
+    // Creates path starting with header unless it already exists, in which case it must start with the same header.
+    // The header is written and checked while holding the lock that flushes take, so a simulation starting at the same
+    // time never reads a header that is still being written.
+    public synchronized void create(Path path, byte[] header) throws IOException {
+        try (FileChannel file = FileChannel.open(path, StandardOpenOption.CREATE, StandardOpenOption.READ, StandardOpenOption.WRITE);
+                FileLock lock = file.lock()) {
+            if (file.size() == 0) {
+                ByteBuffer bytes = ByteBuffer.wrap(header);
+                while (bytes.hasRemaining()) {
+                    file.write(bytes);
+                }
+                return;
+            }
+            ByteBuffer existing = ByteBuffer.allocate(header.length);
+            int read = 0;
+            while (existing.hasRemaining() && read >= 0) {
+                read = file.read(existing);
+            }
+            if (existing.hasRemaining() || !Arrays.equals(existing.array(), header)) {
+                throw new IOException(path + " already exists with a different header");
+            }
+        }
+    }
+
+    // Adds the rows of one completed run, all at once so that the rows of runs on different threads never interleave
+    // and row i of every output file comes from the same run
+    public synchronized void write(Map<Path, ByteArrayOutputStream> rows) throws IOException {
+        for (Map.Entry<Path, ByteArrayOutputStream> row : rows.entrySet()) {
+            ByteArrayOutputStream buffer = buffers.computeIfAbsent(row.getKey(), path -> new ByteArrayOutputStream());
+            row.getValue().writeTo(buffer);
+            if (buffer.size() >= flushBytes) {
+                flush(row.getKey());
+            }
+        }
+    }
+
+    private void flush(Path path) throws IOException {
+        ByteArrayOutputStream buffer = buffers.get(path);
+        if (buffer == null || buffer.size() == 0) {
+            return;
+        }
+        FileChannel file = files.get(path);
+        if (file == null) {
+            file = FileChannel.open(path, StandardOpenOption.CREATE, StandardOpenOption.WRITE, StandardOpenOption.APPEND);
+            files.put(path, file);
+        }
+        ByteBuffer rows = ByteBuffer.wrap(buffer.toByteArray());
+        try (FileLock lock = file.lock()) {
+            while (rows.hasRemaining()) {
+                file.write(rows);
+            }
+        }
+        buffer.reset();
+    }
+
+    public synchronized void flush() throws IOException {
+        for (Path path : buffers.keySet()) {
+            flush(path);
+        }
+    }
+
+    // Writes any buffered rows and closes every file
+    public synchronized void close() throws IOException {
+        try {
+            flush();
+        } finally {
+            for (FileChannel file : files.values()) {
+                file.close();
+            }
+            files.clear();
+        }
+    }
+}
@@ -1,13 +1,21 @@
-import java.nio.file.Files;
+import java.io.ByteArrayOutputStream;
+import java.io.IOException;
+import java.nio.ByteBuffer;
+import java.nio.ByteOrder;
+import java.nio.charset.StandardCharsets;
 import java.nio.file.Path;
 import java.nio.file.Paths;
-import java.nio.file.StandardOpenOption;
 import java.util.ArrayList;
 import java.util.Arrays;
 import java.util.HashMap;
+import java.util.LinkedHashMap;
 import java.util.List;
 import java.util.Map;
 import java.util.TreeMap;
+import java.util.concurrent.ExecutionException;
+import java.util.concurrent.ExecutorService;
+import java.util.concurrent.Executors;
+import java.util.concurrent.Future;
 import java.util.stream.DoubleStream;
 import java.util.stream.IntStream;
 import java.text.DecimalFormat;
@@ -26,6 +34,51 @@ import java.util.random.*;
 public class Simulation {
 
     private static final DecimalFormat df = new DecimalFormat("0.000");
+    private static final String dataDir = "data";
+    // values of each record of a binary metrics file, in the order of the columns of the csv files
+    static final List<String> BINARY_METRICS = binaryMetrics();
+
+    // configuration, as parsed from the command line
+    int n;
+    int m;
+    double q;
+    double mr;
+    double ea;
+    double ep;
+    boolean preventNegativePayoffs;
+    boolean generosity;
+    double g1;
+    double g2;
+    boolean fa;
+    boolean fr;
+    int generations;
+    boolean quiet;
+    double[] network;
+    boolean endN;
+    boolean local;
+    int intervals;
+    int[][] outPartShape;
+    int runs;
+    int threads;
+    int flushBytes;
+    boolean binary;
+    Long seed; // null to seed from system entropy
+    int firstRun;
+    String fileName;
+    List<Map<String, Path>> outPartPaths;
+    Path fAvFreqPath;
+    OutputWriter output;
+
+    private static List<String> binaryMetrics() {
+        List<String> metrics = new ArrayList<>(List.of("coop-rate", "reward-averages", "reward-final", "reward-variances"));
+        for (int k = -5; k < 7; k++) {
+            metrics.add("kAvFreq[" + k + "]");
+        }
+        for (int k = -5; k < 7; k++) {
+            metrics.add("kFinFreq[" + k + "]");
+        }
+        return metrics;
+    }
 
     public static void main(String[] args) throws Exception {
         long startTime = System.currentTimeMillis();
@@ -67,30 +120,32 @@ public class Simulation {
         .build();
         options.addOption(net);
 
+        options.addOption(new Option("runs", true, "Number of independent runs to perform in this process"));
+        options.addOption(new Option("threads", true, "Number of runs to perform at once (with -runs)"));
+        options.addOption(new Option("flushBytes", true, "Bytes of output to buffer per file before writing (default: write at the end of each run)"));
+        options.addOption(new Option("seed", true, "Seed of the random number generators, for reproducible runs"));
+        options.addOption(new Option("firstRun", true, "Index of the first run (with -seed, to split the runs of one seed across processes)"));
+        options.addOption(new Option("binary", false, "Write the per-interval metrics as float32 records to one .bin file per partition instead of csv"));
         options.addOption(new Option("quiet", false, "Run with minimal output"));
         CommandLineParser parser = new DefaultParser(false);
         CommandLine cmd = parser.parse(options, args);
+
+        Simulation simulation = new Simulation(cmd, options);
+        try {
+            simulation.runAll();
+        } catch (IllegalArgumentException e) {
+            System.out.println("Error: " + e.getMessage());
+            System.exit(1);
+        }
+
+        long endTime = System.currentTimeMillis();
+        long executionTime = endTime - startTime;
+
+        System.out.println("Execution time: " + executionTime + " milliseconds");
+    }
+
+    public Simulation(CommandLine cmd, Options options) {
         HelpFormatter formatter = new HelpFormatter();
-        
-        int n;
-        int m;
-        double q;
-        double mr;
-        double ea;
-        double ep;
-        boolean preventNegativePayoffs;
-        boolean generosity;
-        double g1;
-        double g2;
-        boolean fa;
-        boolean fr;
-        int generations;
-        boolean quiet;
-        double[] network;
-        boolean endN;
-        boolean local;
-        int intervals;
-        int[][] outPartShape;
         if (cmd.hasOption("h")) {
             formatter.printHelp("Simulation", options);
             System.out.println();
@@ -209,6 +264,36 @@ public class Simulation {
         } else {
             generations = 100;
         }
+        if(cmd.hasOption("runs")) {
+            runs = Integer.parseInt(cmd.getOptionValue("runs"));
+        } else {
+            runs = 1;
+        }
+        if(cmd.hasOption("threads")) {
+            threads = Integer.parseInt(cmd.getOptionValue("threads"));
+        } else {
+            threads = 1;
+        }
+        if(cmd.hasOption("flushBytes")) {
+            flushBytes = Integer.parseInt(cmd.getOptionValue("flushBytes"));
+        } else {
+            flushBytes = 0;
+        }
+        if(cmd.hasOption("seed")) {
+            seed = Long.parseLong(cmd.getOptionValue("seed"));
+        } else {
+            seed = null;
+        }
+        if(cmd.hasOption("firstRun")) {
+            firstRun = Integer.parseInt(cmd.getOptionValue("firstRun"));
+        } else {
+            firstRun = 0;
+        }
+        if (cmd.hasOption("binary")) {
+            binary = true;
+        } else {
+            binary = false;
+        }
         if (cmd.hasOption("quiet")) {
             quiet = true;
         } else {
@@ -222,10 +307,11 @@ public class Simulation {
             + " fa=" + fa + " fr=" + fr  
             + " generations=" + generations
             + " network=" + network
-            + " intervals=" + intervals);
+            + " intervals=" + intervals
+            + " runs=" + runs + " threads=" + threads
+            + " seed=" + seed + " firstRun=" + firstRun);
         }
 
-        String dataDir = "data";
         StringBuilder sb = new StringBuilder();
         sb.append("n" + n);
         sb.append("_m" + m);
@@ -245,9 +331,9 @@ public class Simulation {
         sb.append("_net" + Arrays.toString(network) );
         sb.append("_intervals" + intervals);
         sb.append("_local" + (local ? "True" : "False") );
-        String fileName = sb.toString();
+        fileName = sb.toString();
         // output paths:
-        List<Map<String, Path>> outPartPaths = new ArrayList<>();
+        outPartPaths = new ArrayList<>();
         int cumInd = 0;
         for (int i = 0; i < outPartShape.length; i++){
             cumInd += outPartShape[i].length;
@@ -260,6 +346,7 @@ public class Simulation {
             pathMap.put("kAvFreq", Paths.get(".", dataDir, fileName + "_kAvFreq" + curPart + ".csv"));
             pathMap.put("kFinFreq", Paths.get(".", dataDir, fileName + "_kFinFreq" + curPart + ".csv"));
             pathMap.put("fAvFreq", Paths.get(".", dataDir, fileName + "_fAvFreq" + curPart + ".csv"));
+            pathMap.put("metrics", Paths.get(".", dataDir, fileName + "_metrics" + curPart + ".bin"));
             outPartPaths.add(pathMap);
         }
         Path coopRatePath = Paths.get(".", dataDir, fileName + "_coop-rate.csv");
@@ -268,7 +355,7 @@ public class Simulation {
         Path rewardFinPath = Paths.get(".", dataDir, fileName + "_reward-final.csv");
         Path kAvFreqPath = Paths.get(".", dataDir, fileName + "_kAvFreq.csv");
         Path kFinFreqPath = Paths.get(".", dataDir, fileName + "_kFinFreq.csv");
-        Path fAvFreqPath = Paths.get(".", dataDir, fileName + "_fAvFreq.csv");
+        fAvFreqPath = Paths.get(".", dataDir, fileName + "_fAvFreq.csv");
         if (!quiet) {
             System.out.println("Output file for cooperation rate: " + coopRatePath);
             System.out.println("Output file for reward variance: " + rewardVarPath);
@@ -278,28 +365,56 @@ public class Simulation {
             System.out.println("Output file for final frequency of donation strategies: " + kFinFreqPath);
             System.out.println("Output file for frequency of forgiveness strategies: " + fAvFreqPath);
         }
+    }
 
+    // Creates the game for one run, drawing all of its random numbers from rand. Throws IllegalArgumentException for an
+    // invalid combination of options, as this may run on a worker thread of runInParallel.
+    DonationGame createGame(RandomGenerator rand, boolean announce) {
         DonationGame game;
         if (!generosity && !fa && !fr && ea == 0.0 && ep == 0.0) {
-            System.out.println("Using DonationGame, i.e., without noise, generosity or forgiveness");
-            game = new DonationGame(n, m, q, mr, preventNegativePayoffs, network, outPartShape);
+            if (announce) {
+                System.out.println("Using DonationGame, i.e., without noise, generosity or forgiveness");
+            }
+            game = new DonationGame(n, m, q, mr, preventNegativePayoffs, network, outPartShape, rand);
             if (local){
                 game.setLocalTrue();
             }
         } else {
             if (generosity && (g1 > 0.0 || g2 > 0.0)) {
                 if (fa || fr) {
-                    System.out.println("Error: Cannot use generosity alongside forgiveness: disable either generosity or forgiveness.");
-                    System.exit(1);
+                    throw new IllegalArgumentException("Cannot use generosity alongside forgiveness: disable either generosity or forgiveness.");
+                }
+                if (announce) {
+                    System.out.println("Using GenerosityDonationGame, i.e., with noise and generosity");
                 }
-                System.out.println("Using GenerosityDonationGame, i.e., with noise and generosity");
-                game = new GenerosityDonationGame(n, m, q, mr, preventNegativePayoffs, ea, ep, g1, g2, network, outPartShape);
+                game = new GenerosityDonationGame(n, m, q, mr, preventNegativePayoffs, ea, ep, g1, g2, network, outPartShape, rand);
             } else if (fa || fr) {
-                System.out.println("Using ForgivenessDonationGame, i.e., with noise and forgiveness");
-                game = new ForgivenessDonationGame(n, m, q, mr, preventNegativePayoffs, ea, ep, fa, fr, network, outPartShape);                
+                if (announce) {
+                    System.out.println("Using ForgivenessDonationGame, i.e., with noise and forgiveness");
+                }
+                game = new ForgivenessDonationGame(n, m, q, mr, preventNegativePayoffs, ea, ep, fa, fr, network, outPartShape, rand);                
             } else {
-                System.out.println("Using NoisyDonationGame, i.e., with noise");
-                game = new NoisyDonationGame(n, m, q, mr, preventNegativePayoffs, ea, ep, network, outPartShape);
+                if (announce) {
+                    System.out.println("Using NoisyDonationGame, i.e., with noise");
+                }
+                game = new NoisyDonationGame(n, m, q, mr, preventNegativePayoffs, ea, ep, network, outPartShape, rand);
+            }
+        }
+        return game;
+    }
+
+    // Performs one run, collecting its rows and passing them to the output writer once the run is complete
+    void run(int run, RandomGenerator rand) throws IOException {
+        if (!quiet && runs > 1) {
+            System.out.println("Run " + run);
+        }
+        DonationGame game = createGame(rand, run == firstRun);
+        Map<Path, ByteArrayOutputStream> rows = new LinkedHashMap<>();
+        float[][] records = null;
+        if (binary) {
+            records = new float[outPartShape.length][recordsPerRun() * BINARY_METRICS.size()];
+            for (float[] partRecords : records) {
+                Arrays.fill(partRecords, Float.NaN); // records after an -endN stop are left as NaN
             }
         }
 
@@ -316,7 +431,7 @@ public class Simulation {
         // if used for more than occasional evaluation should be refactored. 
         Map<Double,Integer> f_counts = new TreeMap<Double,Integer>();
 
-        cumInd = 0;
+        int cumInd = 0;
         for (int i = 0; i < outPartShape.length; i++){
             cumInd += outPartShape[i].length;
             TreeMap<Integer,Integer> cur_counts = new TreeMap<Integer,Integer>();
@@ -337,7 +452,7 @@ public class Simulation {
                     System.out.println("Result: Norm " + kEmerged + " emerged in " + i + " generations");
                     Path singleNormPath = Paths.get(".", dataDir, fileName + "_single-norm.csv");
                     int[] singleNormResult = {kEmerged, i}; // k norm, generations taken
-                    Files.writeString(singleNormPath, Arrays.toString(singleNormResult).replace("[", "").replace("]", "") + System.lineSeparator(), StandardOpenOption.CREATE, StandardOpenOption.APPEND);
+                    append(rows, singleNormPath, Arrays.toString(singleNormResult).replace("[", "").replace("]", "") + System.lineSeparator());
                     break;
                 }
             }
@@ -396,20 +511,16 @@ public class Simulation {
                     if (!quiet) {
                         System.out.println("Average reward: "  + j + ": " + averageReward);
                     }
-                    Files.writeString(outPartPaths.get(j).get("rewardAv"), averageReward + ";", StandardOpenOption.CREATE, StandardOpenOption.APPEND);
                     
                     if (!quiet) {
                         System.out.println("Final reward: "  + j + ": " + finReward);
                     }
-                    Files.writeString(outPartPaths.get(j).get("rewardFin"), finReward + ";", StandardOpenOption.CREATE, StandardOpenOption.APPEND);
         
                     double rewardVariance = varianceRewards[j][i];
                     if (!quiet) {
                         System.out.println("Reward variance: "  + j + ": " + rewardVariance);
                     }
-                    Files.writeString(outPartPaths.get(j).get("rewardVar"), rewardVariance + ";", StandardOpenOption.CREATE, StandardOpenOption.APPEND);
         
-                    Files.writeString(outPartPaths.get(j).get("coopRate"), (float) game.coop_count[j] / game.act_count[j] + ";", StandardOpenOption.CREATE, StandardOpenOption.APPEND);
                     if (!quiet) {
                         System.out.println("Cooperation rate " + j + ": " + (float) game.coop_count[j] / game.act_count[j]);
                     }
@@ -427,7 +538,6 @@ public class Simulation {
                     if (!quiet) {
                         System.out.println("Average k frequencies " + j + ": " + av_k_frequency.get(j));
                     }
-                    Files.writeString(outPartPaths.get(j).get("kAvFreq"), av_k_frequency.get(j).values().toString().replace("[", "").replace("]", "") + ";", StandardOpenOption.CREATE, StandardOpenOption.APPEND);
         
                     //fin_k frequency
                     TreeMap<Integer,Double> cur_fin_frequency = new TreeMap<Integer,Double>();
@@ -442,7 +552,8 @@ public class Simulation {
                     if (!quiet) {
                         System.out.println("Final k frequencies " + j + ": " + fin_k_frequency.get(j));
                     }
-                    Files.writeString(outPartPaths.get(j).get("kFinFreq"), fin_k_frequency.get(j).values().toString().replace("[", "").replace("]", "") + ";", StandardOpenOption.CREATE, StandardOpenOption.APPEND);
+                    writeMetrics(rows, records, j, i / intervals, ";", averageReward, finReward, rewardVariance,
+                        (float) game.coop_count[j] / game.act_count[j], av_k_frequency.get(j), fin_k_frequency.get(j));
                 }
                 k_counts_final.clear();
                 fin_k_frequency.clear();
@@ -471,20 +582,16 @@ public class Simulation {
                 if (!quiet) {
                     System.out.println("Average reward: "  + i + ": " + averageReward);
                 }
-                Files.writeString(outPartPaths.get(i).get("rewardAv"), averageReward + System.lineSeparator(), StandardOpenOption.CREATE, StandardOpenOption.APPEND);
                 
                 if (!quiet) {
                     System.out.println("Final reward: "  + i + ": " + finReward);
                 }
-                Files.writeString(outPartPaths.get(i).get("rewardFin"), finReward + System.lineSeparator(), StandardOpenOption.CREATE, StandardOpenOption.APPEND);
     
                 double rewardVariance = Arrays.stream(varianceRewards[i]).sum() / (double) generations;
                 if (!quiet) {
                     System.out.println("Reward variance: "  + i + ": " + rewardVariance);
                 }
-                Files.writeString(outPartPaths.get(i).get("rewardVar"), rewardVariance + System.lineSeparator(), StandardOpenOption.CREATE, StandardOpenOption.APPEND);
     
-                Files.writeString(outPartPaths.get(i).get("coopRate"), (float) game.coop_count[i] / game.act_count[i] + System.lineSeparator(), StandardOpenOption.CREATE, StandardOpenOption.APPEND);
                 if (!quiet) {
                     System.out.println("Cooperation rate " + i + ": " + (float) game.coop_count[i] / game.act_count[i]);
                 }
@@ -502,7 +609,6 @@ public class Simulation {
                 if (!quiet) {
                     System.out.println("Average k frequencies " + i + ": " + av_k_frequency.get(i));
                 }
-                Files.writeString(outPartPaths.get(i).get("kAvFreq"), av_k_frequency.get(i).values().toString().replace("[", "").replace("]", "") + System.lineSeparator(), StandardOpenOption.CREATE, StandardOpenOption.APPEND);
     
                 //fin_k frequency
                 TreeMap<Integer,Double> cur_fin_frequency = new TreeMap<Integer,Double>();
@@ -517,16 +623,17 @@ public class Simulation {
                 if (!quiet) {
                     System.out.println("Final k frequencies " + i + ": " + fin_k_frequency.get(i));
                 }
-                Files.writeString(outPartPaths.get(i).get("kFinFreq"), fin_k_frequency.get(i).values().toString().replace("[", "").replace("]", "") + System.lineSeparator(), StandardOpenOption.CREATE, StandardOpenOption.APPEND);
+                writeMetrics(rows, records, i, 0, System.lineSeparator(), averageReward, finReward, rewardVariance,
+                    (float) game.coop_count[i] / game.act_count[i], av_k_frequency.get(i), fin_k_frequency.get(i));
             }
-        }else{
+        }else if (!binary){
             for (int i = 0; i < outPartShape.length; i++){
-                Files.writeString(outPartPaths.get(i).get("rewardFin"), System.lineSeparator(), StandardOpenOption.CREATE, StandardOpenOption.APPEND);
-                Files.writeString(outPartPaths.get(i).get("rewardAv"), System.lineSeparator(), StandardOpenOption.CREATE, StandardOpenOption.APPEND);
-                Files.writeString(outPartPaths.get(i).get("rewardVar"), System.lineSeparator(), StandardOpenOption.CREATE, StandardOpenOption.APPEND);
-                Files.writeString(outPartPaths.get(i).get("coopRate"), System.lineSeparator(), StandardOpenOption.CREATE, StandardOpenOption.APPEND);
-                Files.writeString(outPartPaths.get(i).get("kAvFreq"), System.lineSeparator(), StandardOpenOption.CREATE, StandardOpenOption.APPEND);
-                Files.writeString(outPartPaths.get(i).get("kFinFreq"), System.lineSeparator(), StandardOpenOption.CREATE, StandardOpenOption.APPEND);
+                append(rows, outPartPaths.get(i).get("rewardFin"), System.lineSeparator());
+                append(rows, outPartPaths.get(i).get("rewardAv"), System.lineSeparator());
+                append(rows, outPartPaths.get(i).get("rewardVar"), System.lineSeparator());
+                append(rows, outPartPaths.get(i).get("coopRate"), System.lineSeparator());
+                append(rows, outPartPaths.get(i).get("kAvFreq"), System.lineSeparator());
+                append(rows, outPartPaths.get(i).get("kFinFreq"), System.lineSeparator());
             }
         }
 
@@ -542,14 +649,133 @@ public class Simulation {
             if (!quiet) {
                 System.out.println("Average f frequencies:" + av_f_frequency);
             }
-            Files.writeString(fAvFreqPath, av_f_frequency.values().toString().replace("[", "").replace("]", "") + System.lineSeparator(), StandardOpenOption.CREATE, StandardOpenOption.APPEND);
-        } 
+            append(rows, fAvFreqPath, av_f_frequency.values().toString().replace("[", "").replace("]", "") + System.lineSeparator());
+        }
 
-        // Your existing code goes here
+        if (binary) {
+            for (int i = 0; i < outPartShape.length; i++){
+                appendRecords(rows, outPartPaths.get(i).get("metrics"), records[i]);
+            }
+        }
 
-        long endTime = System.currentTimeMillis();
-        long executionTime = endTime - startTime;
+        output.write(rows);
+    }
 
-        System.out.println("Execution time: " + executionTime + " milliseconds");
+    // One generator per run, split in run order from a generator seeded with seed, so that run r draws the same
+    // numbers whichever thread or process performs it and the streams of different runs are independent
+    List<RandomGenerator> runGenerators() {
+        RandomGeneratorFactory<RandomGenerator.SplittableGenerator> factory = RandomGeneratorFactory.of("L64X128MixRandom");
+        RandomGenerator.SplittableGenerator root = seed == null ? factory.create() : factory.create(seed);
+        for (int run = 0; run < firstRun; run++) {
+            root.split();
+        }
+        List<RandomGenerator> generators = new ArrayList<>();
+        for (int run = 0; run < runs; run++) {
+            generators.add(root.split());
+        }
+        return generators;
+    }
+
+    // Performs the runs, each with its own game and random number generator, on up to threads threads
+    void runAll() throws Exception {
+        List<RandomGenerator> generators = runGenerators();
+        output = new OutputWriter(flushBytes);
+        try {
+            if (binary) {
+                for (Map<String, Path> pathMap : outPartPaths) {
+                    output.create(pathMap.get("metrics"), binaryHeader());
+                }
+            }
+            if (threads <= 1) {
+                for (int run = 0; run < runs; run++) {
+                    run(firstRun + run, generators.get(run));
+                }
+            } else {
+                runInParallel(generators);
+            }
+        } finally {
+            output.close();
+        }
+    }
+
+    private void runInParallel(List<RandomGenerator> generators) throws Exception {
+        ExecutorService pool = Executors.newFixedThreadPool(threads);
+        try {
+            List<Future<Void>> results = new ArrayList<>();
+            for (int run = 0; run < runs; run++) {
+                int thisRun = run;
+                results.add(pool.submit(() -> {
+                    run(firstRun + thisRun, generators.get(thisRun));
+                    return null;
+                }));
+            }
+            for (Future<Void> result : results) {
+                try {
+                    result.get();
+                } catch (ExecutionException e) {
+                    // the failure of the run itself, e.g. the IllegalArgumentException of createGame, not its wrapper
+                    if (e.getCause() instanceof Exception cause) {
+                        throw cause;
+                    }
+                    throw e;
+                }
+            }
+        } finally {
+            pool.shutdownNow(); // after a failure, the runs not yet started are dropped
+        }
+    }
+
+    // Writes the metrics of partition part at one interval, or at the end of a run without intervals: to the csv files,
+    // each followed by separator, or as record number record of the partition's binary records
+    private void writeMetrics(Map<Path, ByteArrayOutputStream> rows, float[][] records, int part, int record, String separator,
+            double averageReward, double finReward, double rewardVariance, float coopRate,
+            TreeMap<Integer,Double> avKFrequency, TreeMap<Integer,Double> finKFrequency) {
+        if (binary) {
+            float[] values = records[part];
+            int v = record * BINARY_METRICS.size();
+            values[v++] = coopRate;
+            values[v++] = (float) averageReward;
+            values[v++] = (float) finReward;
+            values[v++] = (float) rewardVariance;
+            for (double frequency : avKFrequency.values()) {
+                values[v++] = (float) frequency;
+            }
+            for (double frequency : finKFrequency.values()) {
+                values[v++] = (float) frequency;
+            }
+            return;
+        }
+        Map<String, Path> paths = outPartPaths.get(part);
+        append(rows, paths.get("rewardAv"), averageReward + separator);
+        append(rows, paths.get("rewardFin"), finReward + separator);
+        append(rows, paths.get("rewardVar"), rewardVariance + separator);
+        append(rows, paths.get("coopRate"), coopRate + separator);
+        append(rows, paths.get("kAvFreq"), avKFrequency.values().toString().replace("[", "").replace("]", "") + separator);
+        append(rows, paths.get("kFinFreq"), finKFrequency.values().toString().replace("[", "").replace("]", "") + separator);
+    }
+
+    private static void append(Map<Path, ByteArrayOutputStream> rows, Path path, String text) {
+        rows.computeIfAbsent(path, p -> new ByteArrayOutputStream()).writeBytes(text.getBytes(StandardCharsets.UTF_8));
+    }
+
+    // Appends float32 values in little-endian order, as read by scripts/analysis/metric_file.py
+    private static void appendRecords(Map<Path, ByteArrayOutputStream> rows, Path path, float[] values) {
+        ByteBuffer bytes = ByteBuffer.allocate(values.length * Float.BYTES).order(ByteOrder.LITTLE_ENDIAN);
+        bytes.asFloatBuffer().put(values);
+        rows.computeIfAbsent(path, p -> new ByteArrayOutputStream()).writeBytes(bytes.array());
+    }
+
+    // Number of records per run in a binary metrics file: one per interval, or one per run without intervals
+    int recordsPerRun() {
+        return intervals == 0 ? 1 : (generations + intervals - 1) / intervals;
+    }
+
+    // The header of a binary metrics file: one line of text describing the float32 records that follow, padded with
+    // spaces to a multiple of 64 bytes. Each run appends recordsPerRun() records of one value per metric.
+    byte[] binaryHeader() {
+        String line = "DGMETRIC version=1 dtype=<f4 records=" + recordsPerRun() + " interval=" + intervals
+            + " generations=" + generations + " metrics=" + String.join(",", BINARY_METRICS);
+        int size = (line.length() + 1 + 63) / 64 * 64;
+        return (line + " ".repeat(size - line.length() - 1) + "\n").getBytes(StandardCharsets.US_ASCII);
     }
 }